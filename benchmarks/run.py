@@ -0,0 +1,212 @@
+"""Hot-path benchmarks for grids, blueprints and the simulation.
+
+Run from the repository root:  python -m benchmarks.run --sizes 100 500 --out results.json
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse, json, platform, random, shutil, statistics, tempfile, time
+import pygame
+from settings import *
+from modes.play_mode import World
+from modes.build_mode import BuildGrid
+from systems.blueprint import Blueprint
+from systems.building import RECIPES
+from systems.component import Component
+from systems.loaders import load_blueprints
+from systems.blueprint_library import BlueprintLibrary, INDEX_FILE
+
+def measure(fn, repeats, setup=None):
+    times = []
+    for _ in range(repeats):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        fn(state) if setup else fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def result(name, size, backend, times, **params):
+    return {
+        "name": name,
+        "size": size,
+        "backend": backend,
+        "params": params,
+        "repeats": len(times),
+        "mean_ms": statistics.fmean(times),
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+    }
+
+def square_blueprint(side=3):
+    return Blueprint("bench", [
+        {"type": "Power", "pos": (x, y)} for y in range(side) for x in range(side)
+    ])
+
+def blueprint_anchors(world, blueprint, side, count):
+    # Non-overlapping anchors on a grid, kept only where the blueprint fits, so
+    # instantiate never takes the failure path inside a timed region
+    return [
+        (x, y)
+        for y in range(0, world.height - side + 1, side)
+        for x in range(0, world.width - side + 1, side)
+        if blueprint.can_place_at(world.grid, x, y)
+    ][:count]
+
+def bench_draw(screen, size, backend, repeats):
+    results = []
+    world = World(size, size, backend)
+    # Levels below LOD_ZOOM go through the one-pixel-per-tile raster (not on chunked worlds)
+    for zoom in ZOOM_LEVELS:
+        if zoom not in world.zoom_levels:
+            continue
+        world.zoom = zoom
+        world.camera_x = world.camera_y = int(size * TILE_SIZE * zoom) // 4
+        world.tile_cache.invalidate()
+        if world.lod:
+            world.lod.surface = None
+        cold = measure(lambda: world.draw(screen, offset_y=0), 1)
+        warm = measure(lambda: world.draw(screen, offset_y=0), repeats)
+        results.append(result("draw_tiles_and_grid.cold", size, backend, cold, zoom=zoom))
+        results.append(result("draw_tiles_and_grid.warm", size, backend, warm, zoom=zoom))
+    return results
+
+def bench_blueprint(size, backend, repeats, count):
+    world = World(size, size, backend)
+    blueprint = square_blueprint()
+    anchors = blueprint_anchors(world, blueprint, 3, count)
+
+    can_place = measure(lambda: [blueprint.can_place_at(world.grid, x, y) for x, y in anchors], repeats)
+
+    def fill():
+        return World(size, size, backend)
+
+    def instantiate(fresh):
+        for x, y in anchors:
+            blueprint.instantiate(fresh.grid, x, y, registry=fresh.registry)
+
+    created = measure(instantiate, repeats, setup=fill)
+    return [
+        result("Blueprint.can_place_at", size, backend, can_place, calls=len(anchors)),
+        result("Blueprint.instantiate", size, backend, created, calls=len(anchors)),
+    ]
+
+def bench_world_update(size, backend, repeats, buildings, ticks):
+    world = World(size, size, backend)
+    color = tuple(RECIPES["TST"]["color"])
+    placed = 0
+    for gy in range(size):
+        for gx in range(size):
+            if placed >= buildings:
+                break
+            world.place_building(gx, gy, "TST", color)
+            placed += 1
+    for building in world.registry:
+        building.receive("iron", 10 ** 6)
+
+    def run():
+        world.update(SIM_TICK_MS)
+        for _ in range(ticks):
+            world.tick(SIM_TICK_MS)
+
+    return [result("World.update", size, backend, measure(run, repeats), buildings=placed, ticks=ticks)]
+
+def bench_remove(size, backend, repeats, groups):
+    blueprint = square_blueprint()
+
+    def setup():
+        world = World(size, size, backend)
+        positions = []
+        for gx, gy in blueprint_anchors(world, blueprint, 4, groups):
+            blueprint.instantiate(world.grid, gx, gy, registry=world.registry)
+            positions.append((gx * TILE_SIZE + 1, gy * TILE_SIZE + 1))
+        return world, positions
+
+    def remove(state):
+        world, positions = state
+        for px, py in positions:
+            world.remove_at(px, py)
+
+    return [result("World.remove_at", size, backend, measure(remove, repeats, setup=setup), groups=groups)]
+
+def bench_extract(size, backend, repeats, components):
+    grid = BuildGrid(size, size, backend)
+    comp = Component("Power", (180, 180, 180))
+    rng = random.Random(1)
+    for _ in range(components):
+        x, y = rng.randrange(size), rng.randrange(size)
+        if grid.grid[y][x].is_clear():
+            grid.grid[y][x].set_occupied(comp)
+    times = measure(grid.extract_blueprint_components, repeats)
+    return [result("BuildGrid.extract_blueprint_components", size, backend, times, components=components)]
+
+def bench_load_blueprints(repeats, files):
+    folder = tempfile.mkdtemp(prefix="pysim_bench_")
+    try:
+        blueprint = square_blueprint(side=8)
+        for i in range(files):
+            blueprint.name = f"bench_{i}"
+            with open(os.path.join(folder, f"bench_{i}.json"), "w") as f:
+                json.dump({"name": blueprint.name, **blueprint.to_dict()}, f, indent=2)
+
+        def drop_index():
+            # Without the index every file is parsed again, so load_blueprints stays cold;
+            # the warm path is the BlueprintLibrary.refresh row
+            index_path = os.path.join(folder, INDEX_FILE)
+            if os.path.exists(index_path):
+                os.remove(index_path)
+
+        times = measure(lambda _: load_blueprints(folder), repeats, setup=drop_index)
+        library = BlueprintLibrary(folder)
+        library.refresh()
+        refresh_times = measure(library.refresh, repeats)
+    finally:
+        shutil.rmtree(folder)
+    return [
+        result("load_blueprints", None, None, times, files=files),
+        result("BlueprintLibrary.refresh", None, None, refresh_times, files=files),
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 2000])
+    parser.add_argument("--backend", choices=["tiles", "numpy"], default="numpy")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--buildings", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--out", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = []
+    for size in args.sizes:
+        print(f"[Bench] {size}x{size} ({args.backend})")
+        results += bench_draw(screen, size, args.backend, args.repeats)
+        results += bench_blueprint(size, args.backend, args.repeats, count=1000)
+        results += bench_world_update(size, args.backend, args.repeats, min(args.buildings, size * size), args.ticks)
+        results += bench_remove(size, args.backend, args.repeats, groups=100)
+        results += bench_extract(size, args.backend, args.repeats, components=min(10000, size * size // 4))
+    results += bench_load_blueprints(args.repeats, args.files)
+
+    for r in results:
+        size = f"{r['size']}" if r["size"] else "-"
+        print(f"{r['name']:<42} {size:>6} {r['median_ms']:>10.3f} ms  {r['params']}")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "args": vars(args),
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[Bench] Results written to {args.out}")
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
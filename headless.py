@@ -0,0 +1,116 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse, json, sys, time
+from settings import *
+from modes.play_mode import World
+from systems.building import RECIPES
+from systems.blueprint_library import BlueprintLibrary
+from systems.savegame import load_world
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the World simulation without a display.")
+    parser.add_argument("--width", type=int, default=GRID_WIDTH)
+    parser.add_argument("--height", type=int, default=GRID_HEIGHT)
+    parser.add_argument("--backend", choices=["tiles", "numpy"], default=GRID_BACKEND)
+    parser.add_argument("--engine", choices=["events", "batch"], default=SIM_ENGINE)
+    parser.add_argument("--seed", type=int, default=WORLD_SEED)
+    parser.add_argument("--world", help="saved world directory to load (see systems/savegame.py)")
+    parser.add_argument("--blueprint", help="blueprint name from data/blueprints to tile across the map")
+    parser.add_argument("--building", help="recipe building (see data/buildings.json) to fill the map with")
+    parser.add_argument("--count", type=int, default=None, help="max placements (default: fill the map)")
+    parser.add_argument("--stock", type=int, default=1000, help="units of each recipe input given to every building")
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--tick-ms", type=int, default=SIM_TICK_MS)
+    parser.add_argument("--json", help="write the report to this file")
+    return parser.parse_args(argv)
+
+def populate_blueprint(world, blueprint, count):
+    layout = blueprint.layout
+    step_x = layout.max_x - layout.min_x + 1
+    step_y = layout.max_y - layout.min_y + 1
+
+    placed = 0
+    for gy in range(-layout.min_y, world.height, step_y):
+        for gx in range(-layout.min_x, world.width, step_x):
+            if count is not None and placed >= count:
+                return placed
+            if blueprint.can_place_at(world.grid, gx, gy):
+                blueprint.instantiate(world.grid, gx, gy, registry=world.registry)
+                placed += 1
+    return placed
+
+def populate_building(world, name, count):
+    color = tuple(RECIPES[name].get("color", (100, 100, 100)))
+    placed = 0
+    for gy in range(world.height):
+        for gx in range(world.width):
+            if count is not None and placed >= count:
+                return placed
+            if world.place_building(gx, gy, name, color):
+                placed += 1
+    return placed
+
+def run(args):
+    start = time.perf_counter()
+    if args.world:
+        world = load_world(args.world, args.backend, args.engine, mmap=True)
+        args.width, args.height = world.width, world.height
+    else:
+        world = World(args.width, args.height, args.backend, args.engine, args.seed)
+
+    placed = 0
+    if args.blueprint:
+        blueprint = BlueprintLibrary().get(args.blueprint)
+        if blueprint is None:
+            sys.exit(f"[Headless] Unknown blueprint '{args.blueprint}'")
+        placed = populate_blueprint(world, blueprint, args.count)
+    elif args.building:
+        if args.building not in RECIPES:
+            sys.exit(f"[Headless] Unknown building '{args.building}'")
+        placed = populate_building(world, args.building, args.count)
+
+    buildings = list(world.registry)
+    for building in buildings:
+        for item in building.recipe.get("inputs", {}):
+            building.receive(item, args.stock)
+    setup_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        world.tick(args.tick_ms)
+    seconds = max(time.perf_counter() - start, 1e-9)
+
+    return {
+        "map": [args.width, args.height],
+        "backend": args.backend,
+        "engine": args.engine,
+        "seed": args.seed,
+        "placements": placed,
+        "buildings": len(buildings),
+        "setup_seconds": setup_seconds,
+        "ticks": args.ticks,
+        "simulated_ms": args.ticks * args.tick_ms,
+        "seconds": seconds,
+        "ticks_per_sec": args.ticks / seconds,
+        "building_updates_per_sec": len(buildings) * args.ticks / seconds,
+        "completions": dict(world.scheduler.completions),
+    }
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+
+    print(f"[Headless] {report['map'][0]}x{report['map'][1]} {report['backend']} grid, {report['engine']} engine")
+    print(f"[Headless] {report['buildings']} buildings from {report['placements']} placements (setup {report['setup_seconds']:.2f}s)")
+    print(f"[Headless] {report['ticks']} ticks in {report['seconds']:.3f}s: "
+          f"{report['ticks_per_sec']:.0f} ticks/sec, {report['building_updates_per_sec']:.0f} building updates/sec")
+    for name, count in sorted(report["completions"].items()):
+        print(f"[Headless]   {name}: {count} completions")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,32 @@
-import pygame, sys, json
+import pygame, sys, json, os, argparse, math, shutil
 from settings import *
 from modes.play_mode import World
 from modes.build_mode import BuildGrid
 from systems.blueprint import Blueprint
-from systems.loaders import load_blueprints
+from systems.blueprint_library import BlueprintLibrary
 from systems.building import Building
 from systems.component import Component
+from systems.sim_clock import SimulationClock
+from systems.profiler import FrameProfiler
+from systems.savegame import can_snapshot, snapshot_world, write_snapshot, load_world
+from systems.journal import recover_world
+from systems.replay import LiveInput, InputRecorder, ReplayInput, replay_sandbox, world_checksum
+from systems.io_worker import IOWorker
+from systems.sprites import SPRITES
+from systems.presenter import ScreenPresenter
 from ui.ui import GUI, BlueprintNamingOverlay
 
+# --- Command line
+parser = argparse.ArgumentParser(description="pysim")
+parser.add_argument("--record", metavar="PATH", help="record input and frame timing to a replay file")
+parser.add_argument("--replay", metavar="PATH", help="play back a recorded session, then exit")
+parser.add_argument("--max-speed", action="store_true", help="replay without waiting for the frame rate")
+parser.add_argument("--headless", action="store_true", help="run without opening a window")
+args = parser.parse_args()
+
+if args.headless:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+
 # --- Init
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -21,7 +40,20 @@ with open("data/buildings.json") as f:
 with open("data/components.json") as f:
     COMPONENT_DATA = json.load(f)
 
-available_buildings = load_blueprints()
+# --- Replays read recorded input and write only into a throwaway folder, so
+# playing one recording twice starts from the same files both times
+replay_input = ReplayInput(args.replay, max_speed=args.max_speed) if args.replay else None
+if replay_input:
+    sandbox, blueprint_folder = replay_sandbox("data/blueprints", replay_input.header.get("blueprints"))
+    quicksave_path = os.path.join(sandbox, "quicksave")
+    autosave_path = os.path.join(sandbox, "autosave")
+    journal_path = os.path.join(sandbox, "journal.jsonl")
+else:
+    sandbox, blueprint_folder = None, "data/blueprints"
+    quicksave_path, autosave_path, journal_path = QUICKSAVE_PATH, AUTOSAVE_PATH, JOURNAL_PATH
+
+blueprint_library = BlueprintLibrary(blueprint_folder)
+available_buildings = blueprint_library.refresh()
 available_components = [
     Component(
         name,
@@ -35,27 +67,72 @@ available_components = [
 
 # --- Game state
 gui = GUI()
-world = World()
+world = None
+if not args.replay and os.path.exists(journal_path):
+    # The last session did not exit cleanly
+    try:
+        world = recover_world(journal_path, (quicksave_path, autosave_path))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[Journal] Recovery failed: {e}")
+if world is None:
+    world = World(CHUNKED_WORLD_SIZE, CHUNKED_WORLD_SIZE) if GRID_BACKEND == "chunked" else World()
+    if not args.replay:
+        world.journal.start(journal_path)
 build_grid = BuildGrid()
+sim_clock = SimulationClock()
+profiler = FrameProfiler()
+presenter = ScreenPresenter()
+io_worker = IOWorker(synchronous=args.replay is not None)
+io_status = None
+autosave_timer = 0
 
 font = pygame.font.SysFont("monospace", 24)
 naming_overlay = BlueprintNamingOverlay(font, 200, 200, 400)
 
+def start_save(path):
+    # Snapshot now, write on the I/O worker; a save still queued for this path is replaced
+    try:
+        snapshot = snapshot_world(world)
+    except ValueError as e:
+        print(f"[Save] {e}")
+        return
+    io_worker.submit("world_save", write_snapshot, snapshot, path, key=path)
+
+# --- Input source
+replay_header = {
+    "seed": world.seed,
+    "backend": GRID_BACKEND,
+    "engine": SIM_ENGINE,
+    "blueprints": [blueprint.name for blueprint in available_buildings],
+}
+if replay_input:
+    input_source = replay_input
+    if {key: input_source.header.get(key) for key in replay_header} != replay_header:
+        print("[Replay] Recorded with different world settings or blueprints, playback may diverge")
+elif args.record:
+    input_source = InputRecorder(args.record, replay_header)
+else:
+    input_source = LiveInput()
+
 naming_active = False
 selected_index = None
 build_mode = False
+show_placement_map = False
+show_minimap = False
 is_panning = False
 last_mouse_pos = (0, 0)
 
 try:
     # --- Main loop
     while True:
-        dt = clock.tick(FPS)
+        dt = input_source.tick(clock)
+        profiler.begin_frame()
         naming_overlay.update(dt)
-        screen.fill(BACKGROUND_COLOR)
 
         target = build_grid if build_mode else world
+        profiler.mark("other")
         target.clear_highlight()
+        profiler.mark("clear_highlight")
         available_items = available_components if build_mode else available_buildings
 
         offset_top = gui.top_height
@@ -63,12 +140,52 @@ try:
         gui_offset = offset_top
 
         target.update(dt, offset_top=offset_top, offset_bottom=offset_bottom)
+        steps = sim_clock.advance(dt, world.tick, steps=input_source.sim_steps())
+        input_source.record_sim_steps(steps)
+
+        autosave_timer += dt
+        if autosave_timer >= AUTOSAVE_INTERVAL_MS:
+            autosave_timer = 0
+            # Chunked worlds have no snapshot format, so there is nothing to autosave
+            if can_snapshot(world):
+                start_save(autosave_path)
+
+        # --- Finished background I/O
+        if blueprint_library.needs_refresh:
+            blueprint_library.needs_refresh = False
+            io_worker.submit("blueprints", blueprint_library.refresh, key="blueprints")
+        for result in io_worker.poll():
+            if result.error:
+                io_status = f"{result.kind} failed: {result.error}"
+                print(f"[IO] {io_status}")
+            elif result.kind == "blueprints":
+                available_buildings = result.value
+                if selected_index is not None and not build_mode and selected_index >= len(available_buildings):
+                    selected_index = None
+            elif result.kind == "blueprint_save":
+                io_status = f"Saved blueprint {result.key}"
+            elif result.kind == "world_save":
+                io_status = f"Saved world {result.key}"
+        profiler.mark("update")
 
         # --- Events
-        for event in pygame.event.get():
+        for event in input_source.events():
             if event.type == pygame.QUIT:
+                profiler.close()
+                input_source.close()
+                io_worker.close()
+                world.journal.close(discard=True)
+                if replay_input:
+                    print(f"[Replay] World checksum {world_checksum(world)} at tick {sim_clock.ticks}")
+                if sandbox:
+                    shutil.rmtree(sandbox, ignore_errors=True)
                 pygame.quit(); sys.exit()
 
+            # --- Uncovered window areas need a full repaint, naming overlay or not
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                presenter.invalidate()
+                continue
+
             # --- If naming overlay is active, block all other input
             if naming_overlay.active:
                 # Block mouse events
@@ -89,10 +206,11 @@ try:
                             components = build_grid.extract_blueprint_components()
                             if components:
                                 blueprint = Blueprint(name, components)
-                                blueprint.save_to_file(f"data/blueprints/{name}.json")
+                                path = os.path.join(blueprint_library.folder, f"{name}.json")
+                                io_worker.submit("blueprint_save", blueprint.save_to_file, path, key=path)
 
-                                # Reload blueprint list after saving
-                                available_buildings = load_blueprints()
+                                # Pick up the new file once written; unchanged blueprints are not reparsed
+                                io_worker.submit("blueprints", blueprint_library.refresh, key="blueprints")
                         continue
 
                 # Let the overlay handle text input and backspace
@@ -100,7 +218,7 @@ try:
                 continue  # still block everything else
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = input_source.mouse_pos()
                 top_bound = gui.top_height
                 bottom_bound = SCREEN_HEIGHT - gui.bottom_height
 
@@ -118,14 +236,14 @@ try:
 
                 elif event.button == 2:  # Middle click for panning
                     is_panning = True
-                    last_mouse_pos = pygame.mouse.get_pos()
+                    last_mouse_pos = input_source.mouse_pos()
 
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 2:
                     is_panning = False
 
             elif event.type == pygame.MOUSEMOTION and is_panning:
-                mx, my = pygame.mouse.get_pos()
+                mx, my = input_source.mouse_pos()
                 dx = last_mouse_pos[0] - mx
                 dy = last_mouse_pos[1] - my
                 target.camera_x += dx
@@ -134,7 +252,7 @@ try:
                 last_mouse_pos = (mx, my)
 
             elif event.type == pygame.MOUSEWHEEL:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = input_source.mouse_pos()
                 delta = event.y * 0.5
                 target.adjust_zoom(delta, mouse_x, mouse_y, offset_top=offset_top, offset_bottom=offset_bottom)
 
@@ -148,9 +266,52 @@ try:
                     print("Build mode ON" if build_mode else "World mode ON")
                     selected_index = None
 
+                elif event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+                    if not target.journal.undo():
+                        print("Nothing to undo")
+
+                elif event.key == pygame.K_y and event.mod & pygame.KMOD_CTRL:
+                    if not target.journal.redo():
+                        print("Nothing to redo")
+
                 elif event.key == pygame.K_q and build_mode:
                     naming_overlay.open()
 
+                elif event.key in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4):
+                    sim_clock.set_speed(event.key - pygame.K_1)
+                    print(f"Simulation speed {sim_clock.speed_label()}")
+
+                elif event.key == pygame.K_F5:
+                    start_save(quicksave_path)
+
+                elif event.key == pygame.K_F9:
+                    try:
+                        loaded = load_world(quicksave_path)
+                        world.journal.close()
+                        world = loaded
+                        if not args.replay:
+                            world.journal.start(journal_path, snapshot=quicksave_path)
+                        selected_index = None
+                        print(f"[Save] Loaded {quicksave_path}")
+                    except (OSError, ValueError) as e:
+                        print(f"[Save] Failed to load {quicksave_path}: {e}")
+
+                elif event.key == pygame.K_F1:
+                    profiler.show_details = not profiler.show_details
+
+                elif event.key == pygame.K_F2:
+                    profiler.toggle_csv()
+
+                elif event.key == pygame.K_m:
+                    show_minimap = not show_minimap
+                    print("Minimap ON" if show_minimap else "Minimap OFF")
+                    if show_minimap and not target.has_minimap:
+                        print("[Minimap] Not available on chunked worlds; shown in build mode only")
+
+                elif event.key == pygame.K_p and not build_mode:
+                    show_placement_map = not show_placement_map
+                    print("Placement map ON" if show_placement_map else "Placement map OFF")
+
                 elif event.key == pygame.K_r and not build_mode and selected_index is not None:
                     selected_item = available_items[selected_index]
                     if isinstance(selected_item, Blueprint):
@@ -171,7 +332,7 @@ try:
 
         # --- Smooth camera motion
         if not naming_overlay.active:
-            keys = pygame.key.get_pressed()
+            keys = input_source.pressed_keys()
             if keys[pygame.K_w]:
                 target.camera_y -= 10 * target.zoom
             if keys[pygame.K_s]:
@@ -182,90 +343,121 @@ try:
                 target.camera_x += 10 * target.zoom
             target.clamp_camera(offset_top=offset_top, offset_bottom=offset_bottom)
 
+        profiler.mark("events")
+
         # --- Highlight logic
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = input_source.mouse_pos()
         target.highlight_tile_at(mouse_x, mouse_y, offset_y=gui_offset)
 
-        # --- Draw world / build grid
-        target.draw(screen, offset_y=gui_offset)
-
-        # --- Blueprint preview (only in world mode)
-        if not build_mode and selected_index is not None:
-            selected_item = available_items[selected_index]
-            if isinstance(selected_item, Blueprint):
-                grid_x, grid_y = target.screen_to_grid(mouse_x, mouse_y, offset_y=gui_offset)
-
-                # Set highlight modes
-                for comp in selected_item.components:
-                    cx, cy = comp["pos"]
-                    tx, ty = grid_x + cx, grid_y + cy
-                    if 0 <= tx < GRID_WIDTH and 0 <= ty < GRID_HEIGHT:
-                        virtual_tile = world.grid[ty][tx]
-                        comp_data = COMPONENT_DATA.get(comp["type"], {})
-                        virtual_comp = Component(
-                            comp["type"],
-                            tuple(comp_data.get("color", (100, 100, 100))),
-                            tuple(comp_data.get("size", [1, 1])),
-                            comp_data.get("valid_tile_types", []),
-                            comp_data.get("valid_subtypes", [])
-                        )
-                        virtual_tile.highlight_mode = (
-                            "buildable" if virtual_tile.is_placeable_by(virtual_comp) else "invalid"
-                        )
-
-                selected_item.draw_preview(
-                    screen, grid_x, grid_y,
-                    cam_x=target.camera_x,
-                    cam_y=target.camera_y,
-                    zoom=target.zoom,
-                    offset_y=gui_offset,
-                    grid=world.grid
-                )
+        # --- Redraw the whole world view only when the camera or its contents changed;
+        # moving the hover/preview repaints just where it was and where it is now
+        world_rect = pygame.Rect(0, offset_top, SCREEN_WIDTH, SCREEN_HEIGHT - offset_top - offset_bottom)
+        preview_item = available_items[selected_index] if selected_index is not None else None
+        preview_orientation = getattr(preview_item, "orientation", None)
+        world_signature = (
+            id(target), target.camera_x, target.camera_y, target.zoom, world_rect.top, world_rect.height,
+            target.content_version, show_placement_map and (id(preview_item), preview_orientation),
+            show_minimap, profiler.show_details,
+            naming_overlay.active and (naming_overlay.text, naming_overlay.cursor_visible),
+        )
+
+        hover_x, hover_y = target.screen_to_grid(mouse_x, mouse_y, offset_y=gui_offset)
+        hover_rect = target.tiles_rect(hover_x, hover_y, offset_y=gui_offset)
+        if not build_mode and isinstance(preview_item, Blueprint):
+            hover_rect.unionall_ip([
+                target.tiles_rect(hover_x + cx, hover_y + cy, *comp.size, offset_y=gui_offset)
+                for cx, cy, comp in preview_item.layout.placements
+            ])
+        elif build_mode and isinstance(preview_item, Component):
+            hover_rect.union_ip(target.tiles_rect(hover_x, hover_y, *preview_item.size, offset_y=gui_offset))
+        hover_dirty = presenter.moved("hover", hover_rect, (hover_x, hover_y, id(preview_item), preview_orientation))
+
+        if presenter.changed("world", world_rect, world_signature):
+            world_dirty = world_rect
+        elif hover_dirty and hover_dirty.colliderect(world_rect):
+            world_dirty = hover_dirty.clip(world_rect)
+        else:
+            world_dirty = None
+        profiler.mark("draw")
+
+        if world_dirty:
+            screen.set_clip(world_dirty)
+            screen.fill(BACKGROUND_COLOR)
+
+            # --- Draw world / build grid
+            target.draw(screen, offset_y=gui_offset)
+            profiler.mark("draw")
+
+            # --- Blueprint preview (only in world mode)
+            if not build_mode and selected_index is not None:
+                selected_item = available_items[selected_index]
+                if isinstance(selected_item, Blueprint):
+                    grid_x, grid_y = target.screen_to_grid(mouse_x, mouse_y, offset_y=gui_offset)
+
+                    # Every anchor where the blueprint fits
+                    if show_placement_map:
+                        world.placement_map.draw(screen, selected_item, offset_y=gui_offset, offset_bottom=offset_bottom)
+
+                    # Set highlight modes
+                    for tx, ty, comp, valid in selected_item.check_placement(world.grid, grid_x, grid_y):
+                        if world.in_bounds(tx, ty):
+                            world.grid[ty][tx].highlight_mode = "buildable" if valid else "invalid"
+
+                    selected_item.draw_preview(
+                        screen, grid_x, grid_y,
+                        cam_x=target.camera_x,
+                        cam_y=target.camera_y,
+                        zoom=target.zoom,
+                        offset_y=gui_offset,
+                        grid=world.grid
+                    )
         
-        # --- Preview for build mode (single component)
-        elif build_mode and selected_index is not None:
-            selected_item = available_items[selected_index]
-            if isinstance(selected_item, Component):
-                grid_x, grid_y = build_grid.screen_to_grid(mouse_x, mouse_y, offset_y=gui_offset)
-
-                # Component placement bounds
-                comp_width, comp_height = selected_item.size
-                tile_px = TILE_SIZE * build_grid.zoom
-                px = grid_x * tile_px - build_grid.camera_x
-                py = grid_y * tile_px - build_grid.camera_y + gui_offset
-
-                # Check validity of all covered tiles
-                invalid = False
-                for dy in range(comp_height):
-                    for dx in range(comp_width):
-                        tx, ty = grid_x + dx, grid_y + dy
-                        if not (0 <= tx < GRID_WIDTH and 0 <= ty < GRID_HEIGHT):
-                            invalid = True
-                        elif not build_grid.grid[ty][tx].is_clear():
-                            invalid = True
-
-                # --- Highlight
-                overlay = pygame.Surface((comp_width * tile_px, comp_height * tile_px), pygame.SRCALPHA)
-                overlay.fill((255, 0, 0, 80) if invalid else (0, 255, 0, 60))
-                screen.blit(overlay, (int(px), int(py)))
-
-                # --- Ghost component
-                surf = pygame.Surface((comp_width * tile_px - int(8 * build_grid.zoom),
-                                    comp_height * tile_px - int(8 * build_grid.zoom)), pygame.SRCALPHA)
-                surf.fill(selected_item.color + (200,))
-                offset = int(4 * build_grid.zoom)
-                screen.blit(surf, (int(px) + offset, int(py) + offset))
+            # --- Preview for build mode (single component)
+            elif build_mode and selected_index is not None:
+                selected_item = available_items[selected_index]
+                if isinstance(selected_item, Component):
+                    grid_x, grid_y = build_grid.screen_to_grid(mouse_x, mouse_y, offset_y=gui_offset)
+
+                    # Component placement bounds
+                    comp_width, comp_height = selected_item.size
+                    tile_px = TILE_SIZE * build_grid.zoom
+                    px = grid_x * tile_px - build_grid.camera_x
+                    py = grid_y * tile_px - build_grid.camera_y + gui_offset
+
+                    # Check validity of all covered tiles
+                    invalid = False
+                    for dy in range(comp_height):
+                        for dx in range(comp_width):
+                            tx, ty = grid_x + dx, grid_y + dy
+                            if not build_grid.in_bounds(tx, ty):
+                                invalid = True
+                            elif not build_grid.grid[ty][tx].is_clear():
+                                invalid = True
+
+                    # --- Highlight
+                    overlay = SPRITES.tint((255, 0, 0, 80) if invalid else (0, 255, 0, 60), build_grid.zoom, selected_item.size)
+                    screen.blit(overlay, (math.floor(px), math.floor(py)))
+
+                    # --- Ghost component
+                    surf = SPRITES.body(selected_item.color, build_grid.zoom, selected_item.size, alpha=200)
+                    offset = int(4 * build_grid.zoom)
+                    screen.blit(surf, (math.floor(px) + offset, math.floor(py) + offset))
         
-        # --- Basic hover highlight when no preview active
-        else:
-            target.highlight_tile_at(mouse_x, mouse_y, offset_y=gui_offset)
+            # --- Basic hover highlight when no preview active
+            else:
+                target.highlight_tile_at(mouse_x, mouse_y, offset_y=gui_offset)
+
+            if show_minimap:
+                target.draw_minimap(screen, offset_top=offset_top, offset_bottom=offset_bottom)
 
-        naming_overlay.draw(screen)
+            naming_overlay.draw(screen)
+            profiler.mark("preview")
+        screen.set_clip(None)
 
         # --- Debug overlay
         grid_x, grid_y = target.screen_to_grid(mouse_x, mouse_y, offset_y=gui_offset)
         tile_info = "Out of bounds"
-        if 0 <= grid_x < GRID_WIDTH and 0 <= grid_y < GRID_HEIGHT:
+        if target.in_bounds(grid_x, grid_y):
             tile = target.grid[grid_y][grid_x]
             tile_info = f"{tile.tile_type}"
             if tile.subtype:
@@ -279,20 +471,29 @@ try:
             f"Mouse Screen: ({mouse_x}, {mouse_y})",
             f"Mouse Grid: ({grid_x}, {grid_y})",
             f"Tile: {tile_info}",
-            f"Camera: ({int(target.camera_x)}, {int(target.camera_y)})"
-        ]
-
-        # --- GUI
-        gui.draw(
-            screen,
-            debug_lines,
-            items=available_items,
-            selected_index=selected_index
-        )
-
-        pygame.display.flip()
+            f"Camera: ({int(target.camera_x)}, {int(target.camera_y)})",
+            f"Sim: {sim_clock.speed_label()} | Tick: {sim_clock.ticks}"
+        ] + ([f"I/O: {io_status}"] if io_status else []) + profiler.debug_lines()
+
+        # --- GUI, each bar redrawn only when its contents changed
+        if presenter.changed("top", gui.top_bar_rect(debug_lines), tuple(debug_lines)):
+            gui.draw_top(screen, debug_lines)
+        if presenter.changed("bottom", gui.bottom_bar_rect(), (tuple(item.name for item in available_items), selected_index)):
+            gui.draw_bottom(screen, items=available_items, selected_index=selected_index)
+
+        graph_rect = pygame.Rect(SCREEN_WIDTH - 310, SCREEN_HEIGHT - gui.bottom_height - 110, 300, 100)
+        if profiler.show_details and presenter.changed("graph", graph_rect, profiler.frames):
+            profiler.draw_graph(screen, graph_rect)
+        profiler.mark("gui")
+
+        presenter.present()
+        profiler.mark("flip")
+        profiler.end_frame()
 except Exception as e:
     import traceback
     traceback.print_exc()
+    io_worker.close(timeout=5)
+    if sandbox:
+        shutil.rmtree(sandbox, ignore_errors=True)
     pygame.quit()
     sys.exit()
\ No newline at end of file
@@ -1,46 +1,30 @@
 from settings import *
-from systems.tile import Tile
-from systems.building import Building
 from systems.basegrid import BaseGrid
 from systems.component import Component
-import pygame
+from systems.blueprint import component_type
+from systems.sprites import SPRITES
 import copy
 
 class BuildGrid(BaseGrid):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, backend=GRID_BACKEND):
+        super().__init__(width, height, backend)
 
     def generate_grid(self):
-        return [[Tile(tile_type="basic") for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        return self.new_grid(tile_type="basic")
 
     def update(self, dt, offset_top=0, offset_bottom=0):
         self.update_camera(dt, offset_top=offset_top, offset_bottom=offset_bottom)
 
     def draw(self, screen, offset_y=0):
-        def draw_tile_fn(screen, tile, gx, gy, x, y, scaled_tile, offset_x, offset_y, offset_top):
-            px = x * scaled_tile - offset_x
-            py = y * scaled_tile - offset_y + offset_top
-            color = tile.get_color()
-            pygame.draw.rect(screen, color, (px, py, scaled_tile, scaled_tile))
+        zoom = self.zoom
+        inset = int(4 * zoom)
 
+        def tile_blits(blits, tile, px, py):
+            blits.append((SPRITES.tile(tile.get_color(), zoom), (px, py)))
             if tile.building:  # In build mode, 'building' = component
-                size = scaled_tile - int(8 * self.zoom)
-                offset = int(4 * self.zoom)
-                surf = pygame.Surface((size, size), pygame.SRCALPHA)
-                surf.fill(tile.building.color + (255,))
-                screen.blit(surf, (int(px) + offset, int(py) + offset))
+                blits.append((SPRITES.body(tile.building.color, zoom), (px + inset, py + inset)))
 
-        self.draw_tiles_and_grid(screen, offset_top=offset_y, draw_tile_fn=draw_tile_fn)
-
-    def clear_highlight(self):
-        for row in self.grid:
-            for tile in row:
-                tile.clear_highlight()
-
-    def highlight_tile_at(self, pixel_x, pixel_y, offset_y=0):
-        gx, gy = self.screen_to_grid(pixel_x, pixel_y, offset_y)
-        if 0 <= gx < GRID_WIDTH and 0 <= gy < GRID_HEIGHT:
-            self.grid[gy][gx].highlighted = True
+        self.draw_tiles_and_grid(screen, offset_top=offset_y, tile_blits_fn=tile_blits)
 
     def place_at(self, pixel_x, pixel_y, offset_y=0, item=None):
         print(f"[PLACE] Attempting to place: {item.name if item else 'None'}")
@@ -51,7 +35,7 @@ class BuildGrid(BaseGrid):
         print(f"[PLACE] Grid position: {grid_x}, {grid_y}")
 
         comp_w, comp_h = item.size
-        if grid_x + comp_w > GRID_WIDTH or grid_y + comp_h > GRID_HEIGHT:
+        if grid_x + comp_w > self.width or grid_y + comp_h > self.height:
             print("[PLACE] Out of bounds!")
             return
 
@@ -64,13 +48,16 @@ class BuildGrid(BaseGrid):
 
         print("[PLACE] Placing component...")
         instance = copy.deepcopy(item)
+        cells = []
         for dy in range(comp_h):
             for dx in range(comp_w):
                 self.grid[grid_y + dy][grid_x + dx].set_occupied(instance)
+                cells.append([grid_x + dx, grid_y + dy, item.name])
+        self.journal.record({"op": "place", "cells": cells})
 
     def remove_at(self, pixel_x, pixel_y, offset_y=0):
         gx, gy = self.screen_to_grid(pixel_x, pixel_y, offset_y)
-        if not (0 <= gx < GRID_WIDTH and 0 <= gy < GRID_HEIGHT):
+        if not self.in_bounds(gx, gy):
             return
 
         target_tile = self.grid[gy][gx]
@@ -80,21 +67,32 @@ class BuildGrid(BaseGrid):
 
         comp_w, comp_h = target_component.size
 
+        cells = []
         for dy in range(comp_h):
             for dx in range(comp_w):
                 tx, ty = gx - dx, gy - dy
-                if 0 <= tx < GRID_WIDTH and 0 <= ty < GRID_HEIGHT:
+                if self.in_bounds(tx, ty):
                     tile = self.grid[ty][tx]
                     if tile.building == target_component:
                         tile.clear()
+                        cells.append([tx, ty, target_component.name])
+        self.journal.record({"op": "remove", "cells": cells})
+
+    def apply_delta(self, delta):
+        # A build grid delta always covers a single component
+        if delta["op"] == "place":
+            instance = copy.deepcopy(component_type(delta["cells"][0][2]))
+            for x, y, _ in delta["cells"]:
+                self.grid[y][x].set_occupied(instance)
+        else:
+            for x, y, _ in delta["cells"]:
+                self.grid[y][x].clear()
 
     def extract_blueprint_components(self):
         components = []
-        for y, row in enumerate(self.grid):
-            for x, tile in enumerate(row):
-                if tile.building:
-                    components.append({
-                        "type": tile.building.name,
-                        "pos": (x, y)
-                    })
+        for x, y in self.occupied_positions():
+            components.append({
+                "type": self.grid[y][x].building.name,
+                "pos": (x, y)
+            })
         return components
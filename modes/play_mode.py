@@ -1,71 +1,92 @@
-import pygame
 from settings import *
-from systems.tile import Tile
 from systems.building import Building
-from systems.component import Component
 from systems.basegrid import BaseGrid
+from systems.chunked_grid import ChunkedGrid
+from systems.worldgen import generate_deposits, paint_deposits
+from systems.registry import BuildingRegistry
+from systems.recipe_scheduler import RecipeScheduler
+from systems.batch_sim import BatchSimulation
+from systems.placement_map import PlacementMap
+from systems.sprites import SPRITES
+import uuid
 
 class World(BaseGrid):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, backend=GRID_BACKEND, engine=SIM_ENGINE, seed=WORLD_SEED):
+        self.seed = seed
+        super().__init__(width, height, backend)
+        self.scheduler = BatchSimulation() if engine == "batch" else RecipeScheduler()
+        self.registry = BuildingRegistry(scheduler=self.scheduler)
+        self.placement_map = PlacementMap(self)
+        self.tile_listeners.append(self.placement_map)
+        self.saved_terrain = None       # terrain arrays encoded by the first save of a tile-object world
 
     def generate_grid(self):
-        grid = [[Tile("basic") for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        grid[5][5] = Tile("resource", "iron")
-        grid[6][7] = Tile("resource", "coal")
-        grid[4][6] = Tile("resource", "limestone")
+        grid = self.new_grid("basic")
+        if self.seed is not None and not isinstance(grid, ChunkedGrid):
+            paint_deposits(grid, generate_deposits(self.seed, 0, 0, self.width, self.height))
         return grid
 
+    def generate_chunk(self, x0, y0, width, height):
+        rows = super().generate_chunk(x0, y0, width, height)
+        if self.seed is not None:
+            paint_deposits(rows, generate_deposits(self.seed, x0, y0, width, height))
+        return rows
+
     def update(self, dt, offset_top=0, offset_bottom=0):
         self.update_camera(dt, offset_top=offset_top, offset_bottom=offset_bottom)
 
-        for row in self.grid:
-            for tile in row:
-                if tile.building:
-                    tile.clear_highlight()
-                    tile.building.update(dt)
-
-    def draw(self, screen, offset_y=0):
-        def draw_tile(screen, tile, gx, gy, x, y, scaled_tile, offset_x, offset_y_camera, offset_top):
-            color = tile.get_color()
+        if isinstance(self.grid, ChunkedGrid):
+            tile_px = TILE_SIZE * self.zoom
+            center_x = int((self.camera_x + SCREEN_WIDTH / 2) // tile_px)
+            center_y = int((self.camera_y + (SCREEN_HEIGHT - offset_top - offset_bottom) / 2) // tile_px)
+            self.grid.evict_far(center_x, center_y, CHUNK_KEEP_RADIUS)
 
-            px = x * scaled_tile - offset_x
-            py = y * scaled_tile - offset_y_camera + offset_top
-            rect = pygame.Rect(int(px), int(py), int(scaled_tile), int(scaled_tile))
-            pygame.draw.rect(screen, color, rect)
+    def resolve_building(self, group_id, x, y):
+        return self.registry.groups.get(group_id, {}).get((x, y))
 
-            if tile.building:
-                tile.building.draw(screen, gx, gy, self.camera_x, self.camera_y, self.zoom, offset_top)
+    def tick(self, dt):
+        # One fixed simulation step, driven by SimulationClock
+        self.scheduler.advance(dt)
 
-        self.draw_tiles_and_grid(screen, offset_top=offset_y, draw_tile_fn=draw_tile)
+    def draw(self, screen, offset_y=0):
+        zoom = self.zoom
+        inset = int(4 * zoom)
 
-    def clear_highlight(self):
-        for row in self.grid:
-            for tile in row:
-                tile.clear_highlight()
+        def tile_blits(blits, tile, px, py):
+            blits.append((SPRITES.tile(tile.get_color(), zoom), (px, py)))
+            if tile.building:
+                blits.append((SPRITES.body(tile.building.color, zoom), (px + inset, py + inset)))
 
-    def highlight_tile_at(self, pixel_x, pixel_y, offset_y=0):
-        grid_x, grid_y = self.screen_to_grid(pixel_x, pixel_y, offset_y)
-        if 0 <= grid_x < GRID_WIDTH and 0 <= grid_y < GRID_HEIGHT:
-            self.grid[grid_y][grid_x].highlighted = True
+        self.draw_tiles_and_grid(screen, offset_top=offset_y, tile_blits_fn=tile_blits)
 
     def place_at(self, pixel_x, pixel_y, offset_y=0, item=None):
         gx, gy = self.screen_to_grid(pixel_x, pixel_y, offset_y)
-        if 0 <= gx < GRID_WIDTH and 0 <= gy < GRID_HEIGHT and item:
-            tile = self.grid[gy][gx]
-
+        if self.in_bounds(gx, gy) and item:
             # --- NEW: check if item is a Blueprint
             if hasattr(item, "instantiate"):
                 print(f"[World] Placing blueprint '{item.name}' at ({gx}, {gy})")
-                item.instantiate(self.grid, gx, gy)
+                group_id = item.instantiate(self.grid, gx, gy, registry=self.registry)
             else:
                 # Fallback to placing a simple building
-                if tile.is_buildable() and tile.building is None:
-                    tile.building = Building(item.name, item.color)
+                building = self.place_building(gx, gy, item.name, item.color)
+                group_id = building.group_id if building else None
+
+            if group_id is not None:
+                self.journal.record(self.group_delta("place", group_id))
+
+    def place_building(self, gx, gy, name, color):
+        tile = self.grid[gy][gx]
+        if not tile.is_buildable() or tile.building is not None:
+            return None
+
+        building = Building(name, color, group_id=str(uuid.uuid4()))
+        tile.set_occupied(building)
+        self.registry.add(building, gx, gy)
+        return building
     
     def remove_at(self, pixel_x, pixel_y, offset_y=0):
         gx, gy = self.screen_to_grid(pixel_x, pixel_y, offset_y)
-        if not (0 <= gx < GRID_WIDTH and 0 <= gy < GRID_HEIGHT):
+        if not self.in_bounds(gx, gy):
             return
 
         target_tile = self.grid[gy][gx]
@@ -73,11 +94,28 @@ class World(BaseGrid):
         if not building:
             return
 
-        group_id = getattr(building, "group_id", None)
+        delta = self.group_delta("remove", building.group_id)
+        self.remove_groups([building.group_id])
+        self.journal.record(delta)
+
+    def group_delta(self, op, group_id):
+        cells = [
+            [x, y, building.name, list(building.color), group_id]
+            for (x, y), building in self.registry.groups.get(group_id, {}).items()
+        ]
+        return {"op": op, "cells": cells}
+
+    def apply_delta(self, delta):
+        # Replays a journaled edit without recording it again
+        if delta["op"] == "place":
+            for x, y, name, color, group_id in delta["cells"]:
+                building = Building(name, tuple(color), group_id=group_id)
+                self.grid[y][x].set_occupied(building)
+                self.registry.add(building, x, y)
+        else:
+            self.remove_groups({cell[4] for cell in delta["cells"]})
 
-        # Remove all tiles that share this building instance
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                tile = self.grid[y][x]
-                if tile.building and getattr(tile.building, "group_id", None) == group_id:
-                    tile.clear()
+    def remove_groups(self, group_ids):
+        # Only the tiles indexed under these groups are touched
+        for x, y in self.registry.remove_groups(group_ids):
+            self.grid[y][x].clear()
@@ -6,7 +6,54 @@ TILE_SIZE = 32
 GRID_WIDTH = 100
 GRID_HEIGHT = 100
 
+# Tile storage: "tiles" keeps a list of Tile objects, "numpy" packs tiles into arrays
+GRID_BACKEND = "tiles"
+
+# "chunked" backend: lazily generated world, sized by what has been explored
+CHUNKED_WORLD_SIZE = 1 << 20    # nominal tiles per side
+WORLD_CHUNK_SIZE = 32           # tiles per side of a generated chunk
+CHUNK_KEEP_RADIUS = 4           # chunks around the camera kept in memory
+
+# World snapshots
+QUICKSAVE_PATH = "saves/quicksave"
+AUTOSAVE_PATH = "saves/autosave"
+AUTOSAVE_INTERVAL_MS = 5 * 60 * 1000
+JOURNAL_PATH = "saves/journal.jsonl"   # edits since the last snapshot, removed on clean exit
+JOURNAL_UNDO_LIMIT = 500
+
+# Procedural resource deposits
+WORLD_SEED = 1337
+RESOURCE_SCALE = 24             # tiles between noise lattice points
+RESOURCE_THRESHOLD = 0.72       # noise value above which a deposit appears
+
 FPS = 60
+PROFILER_WINDOW = 300           # frames kept for frame-time percentiles
+PROFILE_DIR = "profiles"        # where F2 CSV exports are written (git-ignored)
+
+# Simulation runs in fixed ticks, independent of frame rate
+SIM_TICK_MS = 50                # 20 ticks per second at 1x
+SIM_MAX_CATCH_UP = 5            # ticks per frame (per speed step) before dropping time
+SIM_MAX_SPEED_BUDGET_MS = 10    # frame time spent simulating at "max" speed
+
+# Recipe engine: "events" wakes buildings from a completion queue,
+# "batch" advances all buildings of a recipe together with NumPy
+SIM_ENGINE = "events"
+
+# Tile layer render cache
+CHUNK_SIZE = 16                 # tiles per side of a cached chunk surface
+TILE_CACHE_MAX_CHUNKS = 64      # chunk surfaces kept before the least recently used is dropped
+SPRITE_CACHE_MAX = 256          # pre-scaled building/component/preview sprites kept
+
+# Display
+DIRTY_RECT_UPDATES = True       # redraw and present only the screen regions that changed
+TEXT_CACHE_MAX = 256            # rendered text surfaces kept per font
+
+# Zoom and level of detail
+ZOOM_LEVELS = [1 / 64, 1 / 32, 1 / 16, 1 / 8, 0.25, 0.5, 1.0, 1.5, 2.0]
+LOD_ZOOM = 0.5                  # below this the map is drawn from a one-pixel-per-tile raster
+MINIMAP_SIZE = 200
+MINIMAP_BORDER_COLOR = (40, 40, 60)
+MINIMAP_VIEW_COLOR = (255, 60, 60)
 
 BLUEPRINT_BG = (230, 240, 255)
 BACKGROUND_COLOR = (230, 240, 255)
@@ -28,4 +75,8 @@ TILE_BASE_COLORS = {
 HIGHLIGHT_COLORS = {
     "buildable": (180, 255, 180),
     "invalid": (255, 150, 150),
-}
\ No newline at end of file
+}
+
+# Valid-anchor overlay for the selected blueprint
+PLACEMENT_MAP_COLOR = (0, 220, 0)
+PLACEMENT_MAP_ALPHA = 90
\ No newline at end of file
@@ -0,0 +1,164 @@
+import numpy as np
+from settings import HIGHLIGHT_COLORS
+from systems.tile import Tile
+
+HIGHLIGHT_MODES = [None] + list(HIGHLIGHT_COLORS)
+NO_BUILDING = -1
+
+class TileView(Tile):
+    """Tile-compatible view onto one cell of an ArrayGrid."""
+
+    def __init__(self, store, x, y):
+        self.store = store
+        self.x = x
+        self.y = y
+
+    @property
+    def owner(self):
+        return self.store.owner
+
+    def attach(self, owner, x, y):
+        self.store.owner = owner
+
+    @property
+    def tile_type(self):
+        return self.store.tile_types[self.store.tile_type[self.y, self.x]]
+
+    @tile_type.setter
+    def tile_type(self, value):
+        self.store.tile_type[self.y, self.x] = self.store.intern(self.store.tile_types, value)
+
+    @property
+    def subtype(self):
+        return self.store.subtypes[self.store.subtype[self.y, self.x]]
+
+    @subtype.setter
+    def subtype(self, value):
+        self.store.subtype[self.y, self.x] = self.store.intern(self.store.subtypes, value)
+
+    @property
+    def state(self):
+        return "occupied" if self.store.occupied[self.y, self.x] else "clear"
+
+    @state.setter
+    def state(self, value):
+        self.store.occupied[self.y, self.x] = value == "occupied"
+
+    @property
+    def building(self):
+        return self.store.objects.get(int(self.store.building_id[self.y, self.x]))
+
+    @building.setter
+    def building(self, obj):
+        self.store.set_building(self.x, self.y, obj)
+
+    @property
+    def _highlight_mode(self):
+        return HIGHLIGHT_MODES[self.store.highlight_mode[self.y, self.x]]
+
+    @_highlight_mode.setter
+    def _highlight_mode(self, mode):
+        self.store.highlight_mode[self.y, self.x] = HIGHLIGHT_MODES.index(mode)
+
+    @property
+    def _highlighted(self):
+        return bool(self.store.highlighted[self.y, self.x])
+
+    @_highlighted.setter
+    def _highlighted(self, value):
+        self.store.highlighted[self.y, self.x] = value
+
+class GridRow:
+    def __init__(self, store, y):
+        self.store = store
+        self.y = y
+
+    def __len__(self):
+        return self.store.width
+
+    def __getitem__(self, x):
+        return TileView(self.store, x, self.y)
+
+    def __setitem__(self, x, tile):
+        view = TileView(self.store, x, self.y)
+        view.tile_type = tile.tile_type
+        view.subtype = tile.subtype
+        view.state = tile.state
+        view.building = tile.building
+        view._highlight_mode = tile.highlight_mode
+        view._highlighted = tile.highlighted
+        view.mark_changed()
+
+    def __iter__(self):
+        for x in range(self.store.width):
+            yield TileView(self.store, x, self.y)
+
+class ArrayGrid:
+    """Struct-of-arrays tile storage; grid[y][x] returns a TileView."""
+
+    def __init__(self, width, height, tile_type="basic", subtype=None):
+        self.width = width
+        self.height = height
+        self.owner = None
+
+        # Code tables, index into these with the arrays below
+        self.tile_types = [tile_type]
+        self.subtypes = [subtype]
+
+        shape = (height, width)
+        self.tile_type = np.zeros(shape, dtype=np.uint8)
+        self.subtype = np.zeros(shape, dtype=np.uint8)
+        self.occupied = np.zeros(shape, dtype=bool)
+        self.building_id = np.full(shape, NO_BUILDING, dtype=np.int32)
+        self.highlight_mode = np.zeros(shape, dtype=np.uint8)
+        self.highlighted = np.zeros(shape, dtype=bool)
+
+        # Building objects referenced by building_id
+        self.objects = {}
+        self.object_ids = {}        # id(obj) -> building_id
+        self.refcounts = {}
+        self.next_id = 0
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        return GridRow(self, y)
+
+    def attach(self, owner):
+        self.owner = owner
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield GridRow(self, y)
+
+    def intern(self, table, value):
+        if value not in table:
+            table.append(value)
+        return table.index(value)
+
+    def set_building(self, x, y, obj):
+        old = int(self.building_id[y, x])
+        if old != NO_BUILDING:
+            self.refcounts[old] -= 1
+            if self.refcounts[old] == 0:
+                del self.object_ids[id(self.objects.pop(old))]
+                del self.refcounts[old]
+
+        if obj is None:
+            self.building_id[y, x] = NO_BUILDING
+            return
+
+        obj_id = self.object_ids.get(id(obj))
+        if obj_id is None:
+            obj_id = self.next_id
+            self.next_id += 1
+            self.objects[obj_id] = obj
+            self.object_ids[id(obj)] = obj_id
+            self.refcounts[obj_id] = 0
+        self.refcounts[obj_id] += 1
+        self.building_id[y, x] = obj_id
+
+    def building_positions(self):
+        ys, xs = np.nonzero(self.building_id != NO_BUILDING)
+        return list(zip(xs.tolist(), ys.tolist()))
@@ -1,9 +1,22 @@
 import abc
+import math
 import pygame
 from settings import *
+from systems.tile import Tile
+from systems.array_grid import ArrayGrid
+from systems.chunked_grid import ChunkedGrid
+from systems.tile_cache import TileLayerCache
+from systems.journal import ChangeJournal
+from systems.viewport import Viewport
+from systems.grid_overlay import GridOverlay
+from systems.lod import TileColorRaster
 
 class BaseGrid(abc.ABC):
-    def __init__(self):
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, backend=GRID_BACKEND):
+        self.width = width
+        self.height = height
+        self.backend = backend
+
         self.camera_x = 0
         self.camera_y = 0
         self.camera_ax = 0
@@ -14,11 +27,77 @@ class BaseGrid(abc.ABC):
         self.scroll_accel = 2000
         self.scroll_max_speed = 600
 
+        # Chunked worlds are too large for a whole-map raster, so they stop at the LOD threshold
         self.zoom = 1.0
-        self.min_zoom = 0.5
-        self.max_zoom = 2.0
-
+        self.zoom_levels = [z for z in ZOOM_LEVELS if z >= LOD_ZOOM] if backend == "chunked" else ZOOM_LEVELS
+        self.min_zoom = self.zoom_levels[0]
+        self.max_zoom = self.zoom_levels[-1]
+        self.has_minimap = backend != "chunked"
+        self.lod = None
+
+        self.tile_cache = TileLayerCache()
+        self.grid_overlay = GridOverlay()
+        self.tile_listeners = []     # notified with tile_changed(x, y) on occupancy changes
+        self.highlighted_tiles = set()
+        self.content_version = 0     # bumped on every occupancy change, for redraw checks
+        self.journal = ChangeJournal(self)
         self.grid = self.generate_grid()
+        self.attach_tiles()
+
+    def new_grid(self, tile_type="basic"):
+        if self.backend == "numpy":
+            return ArrayGrid(self.width, self.height, tile_type)
+        if self.backend == "chunked":
+            return ChunkedGrid(self.width, self.height, self.generate_chunk, self.resolve_building)
+        return [[Tile(tile_type) for _ in range(self.width)] for _ in range(self.height)]
+
+    def generate_chunk(self, x0, y0, width, height):
+        # Tiles for one chunk of a "chunked" grid
+        return [[Tile("basic") for _ in range(width)] for _ in range(height)]
+
+    def resolve_building(self, group_id, x, y):
+        # Building to put back on a tile when a chunk is reloaded from disk
+        return None
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def attach_tiles(self):
+        if isinstance(self.grid, ArrayGrid):
+            self.grid.attach(self)
+            return
+        if isinstance(self.grid, ChunkedGrid):
+            self.grid.attach(self)
+            self.tile_listeners.append(self.grid)
+            return
+
+        for y, row in enumerate(self.grid):
+            for x, tile in enumerate(row):
+                tile.attach(self, x, y)
+
+    def mark_tile_dirty(self, x, y):
+        self.tile_cache.mark_dirty(x, y)
+
+    def mark_tile_highlighted(self, x, y, active):
+        # Remember highlighted tiles so clear_highlight only visits those
+        if active:
+            self.highlighted_tiles.add((x, y))
+        else:
+            self.highlighted_tiles.discard((x, y))
+        self.mark_tile_dirty(x, y)
+
+    def mark_tile_changed(self, x, y):
+        self.content_version += 1
+        self.mark_tile_dirty(x, y)
+        for listener in self.tile_listeners:
+            listener.tile_changed(x, y)
+
+    def tiles_rect(self, grid_x, grid_y, width=1, height=1, offset_y=0):
+        # Screen rect covering a block of tiles, padded for rounding and the grid lines
+        tile_px = TILE_SIZE * self.zoom
+        left = math.floor(grid_x * tile_px - self.camera_x)
+        top = math.floor(grid_y * tile_px - self.camera_y) + offset_y
+        return pygame.Rect(left, top, int(width * tile_px) + 1, int(height * tile_px) + 1).inflate(4, 4)
 
     def screen_to_grid(self, pixel_x, pixel_y, offset_y=0):
         tile_px = TILE_SIZE * self.zoom
@@ -30,8 +109,8 @@ class BaseGrid(abc.ABC):
         tile_px = TILE_SIZE * self.zoom
         view_w = SCREEN_WIDTH
         view_h = SCREEN_HEIGHT - offset_top - offset_bottom
-        world_w = GRID_WIDTH * tile_px
-        world_h = GRID_HEIGHT * tile_px
+        world_w = self.width * tile_px
+        world_h = self.height * tile_px
         margin = tile_px
 
         max_x = max(-margin, world_w - view_w + margin)
@@ -41,7 +120,7 @@ class BaseGrid(abc.ABC):
         self.camera_y = max(-margin, min(self.camera_y, max_y))
 
     def adjust_zoom(self, delta, mouse_x, mouse_y, offset_top=0, offset_bottom=0):
-        zoom_levels = [0.5, 1.0, 1.5, 2.0]
+        zoom_levels = self.zoom_levels
         closest_zoom = min(zoom_levels, key=lambda z: abs(z - self.zoom))
         current_index = zoom_levels.index(closest_zoom)
         new_index = max(0, min(current_index + int(delta / 0.5), len(zoom_levels) - 1))
@@ -85,53 +164,57 @@ class BaseGrid(abc.ABC):
         self.camera_y += self.camera_vy * seconds
         self.clamp_camera(offset_top=offset_top, offset_bottom=offset_bottom)
 
-    def draw_grid_overlay(self, screen, tiles_x, tiles_y, cam_offset_x, cam_offset_y, gui_offset=0):
-        scaled_tile = TILE_SIZE * self.zoom
+    def viewport(self, offset_top=0, offset_bottom=0):
+        view_h = SCREEN_HEIGHT - offset_top - offset_bottom
+        return Viewport(self.camera_x, self.camera_y, self.zoom, SCREEN_WIDTH, view_h, offset_top, self.width, self.height)
 
-        for x in range(tiles_x + 1):
-            px = int(x * scaled_tile - cam_offset_x)
-            pygame.draw.line(screen, BLUEPRINT_BG, (px, gui_offset), (px, SCREEN_HEIGHT))
+    def draw_grid_overlay(self, screen, viewport):
+        # Cached line layer, rebuilt only when the zoom or screen size changes
+        self.grid_overlay.draw(screen, viewport)
 
-        for y in range(tiles_y + 1):
-            py = int(y * scaled_tile - cam_offset_y + gui_offset)
-            pygame.draw.line(screen, BLUEPRINT_BG, (0, py), (SCREEN_WIDTH, py))
+    def lod_raster(self):
+        if self.lod is None:
+            self.lod = TileColorRaster(self)
+            self.tile_listeners.append(self.lod)
+        return self.lod
 
-    def draw_tiles_and_grid(self, screen, offset_top=0, offset_bottom=0, draw_tile_fn=None):
-        scaled_tile = TILE_SIZE * self.zoom
-        view_w = SCREEN_WIDTH
-        view_h = SCREEN_HEIGHT - offset_top - offset_bottom
+    def draw_minimap(self, screen, offset_top=0, offset_bottom=0):
+        if not self.has_minimap:
+            return
+        rect = pygame.Rect(SCREEN_WIDTH - MINIMAP_SIZE - 10, offset_top + 10, MINIMAP_SIZE, MINIMAP_SIZE)
+        self.lod_raster().draw_minimap(screen, rect, self.viewport(offset_top, offset_bottom))
 
-        tiles_x = view_w // int(scaled_tile) + 2
-        tiles_y = view_h // int(scaled_tile) + 2
+    def draw_tiles_and_grid(self, screen, offset_top=0, offset_bottom=0, tile_blits_fn=None):
+        viewport = self.viewport(offset_top, offset_bottom)
 
-        start_x = int(self.camera_x // scaled_tile)
-        start_y = int(self.camera_y // scaled_tile)
+        # --- Zoomed out: one scaled blit of the tile colour raster, no grid lines
+        if self.zoom < LOD_ZOOM:
+            self.lod_raster().draw(screen, viewport)
+            return
 
-        cam_offset_x = self.camera_x % scaled_tile
-        cam_offset_y = self.camera_y % scaled_tile
+        # --- Tiles are drawn through cached chunk surfaces, repainted only where dirty
+        if tile_blits_fn:
+            self.tile_cache.draw(screen, self.grid, viewport, tile_blits_fn)
 
-        for y in range(tiles_y):
-            for x in range(tiles_x):
-                gx = start_x + x
-                gy = start_y + y
-                if 0 <= gx < GRID_WIDTH and 0 <= gy < GRID_HEIGHT:
-                    tile = self.grid[gy][gx]
-                    if draw_tile_fn:
-                        draw_tile_fn(
-                            screen, tile, gx, gy, x, y,
-                            scaled_tile, cam_offset_x, cam_offset_y, offset_top
-                        )
+        self.draw_grid_overlay(screen, viewport)
 
-        self.draw_grid_overlay(screen, tiles_x, tiles_y, cam_offset_x, cam_offset_y, gui_offset=offset_top)
+    def occupied_positions(self):
+        if isinstance(self.grid, (ArrayGrid, ChunkedGrid)):
+            return self.grid.building_positions()
+        return [
+            (x, y)
+            for y, row in enumerate(self.grid)
+            for x, tile in enumerate(row)
+            if tile.building
+        ]
 
     def clear_highlight(self):
-        for row in self.grid:
-            for tile in row:
-                tile.clear_highlight()
+        for x, y in list(self.highlighted_tiles):
+            self.grid[y][x].clear_highlight()
                 
     def highlight_tile_at(self, pixel_x, pixel_y, offset_y=0):
         grid_x, grid_y = self.screen_to_grid(pixel_x, pixel_y, offset_y)
-        if 0 <= grid_x < GRID_WIDTH and 0 <= grid_y < GRID_HEIGHT:
+        if self.in_bounds(grid_x, grid_y):
             self.grid[grid_y][grid_x].highlighted = True
             
     @abc.abstractmethod
@@ -1,18 +1,107 @@
-import json, os
-import pygame
+import json, os, math
 from systems.component import Component
 from systems.building import Building
+from systems.sprites import SPRITES
 from settings import TILE_SIZE, GRID_WIDTH, GRID_HEIGHT
 import uuid
 
 with open(os.path.join("data", "components.json")) as f:
     COMPONENT_DATA = json.load(f)
 
+COMPONENT_TYPES = {}
+
+def component_type(name):
+    # Shared, read-only Component used to validate placements of this type
+    comp = COMPONENT_TYPES.get(name)
+    if comp is None:
+        data = COMPONENT_DATA.get(name, {})
+        comp = Component(
+            name,
+            tuple(data.get("color", (100, 100, 100))),
+            tuple(data.get("size", [1, 1])),
+            frozenset(data.get("valid_tile_types", [])),
+            frozenset(data.get("valid_subtypes", []))
+        )
+        COMPONENT_TYPES[name] = comp
+    return comp
+
+# Orientation index = quarter turns + 4 * flipped; these map an index to the
+# index after one more operation is applied on top of it
+ROTATE_90 = [(turns + 1) % 4 + 4 * flipped for flipped in (0, 1) for turns in range(4)]
+FLIP_HORIZONTAL = [(-turns) % 4 + 4 * (1 - flipped) for flipped in (0, 1) for turns in range(4)]
+FLIP_VERTICAL = [(2 - turns) % 4 + 4 * (1 - flipped) for flipped in (0, 1) for turns in range(4)]
+
+class BlueprintLayout:
+    """One orientation of a blueprint with its component types resolved."""
+
+    def __init__(self, components, positions):
+        self.components = [
+            {"type": comp["type"], "pos": pos}
+            for comp, pos in zip(components, positions)
+        ]
+        self.placements = [
+            (pos[0], pos[1], component_type(comp["type"]))
+            for comp, pos in zip(components, positions)
+        ]
+
+        xs = [pos[0] for pos in positions] or [0]
+        ys = [pos[1] for pos in positions] or [0]
+        self.min_x, self.max_x = min(xs), max(xs)
+        self.min_y, self.max_y = min(ys), max(ys)
+
+    def fits(self, grid_w, grid_h, grid_x, grid_y):
+        return (
+            0 <= grid_x + self.min_x and grid_x + self.max_x < grid_w and
+            0 <= grid_y + self.min_y and grid_y + self.max_y < grid_h
+        )
+
+class CompiledBlueprint:
+    """All 8 orientations of a component list, computed once."""
+
+    def __init__(self, components):
+        base = [tuple(comp["pos"]) for comp in components]
+        self.layouts = []
+
+        for flipped in (False, True):
+            for turns in range(4):
+                if not flipped and turns == 0:
+                    self.layouts.append(BlueprintLayout(components, base))
+                    continue
+
+                positions = []
+                for x, y in base:
+                    if flipped:
+                        x = -x
+                    for _ in range(turns):
+                        x, y = -y, x
+                    positions.append((x, y))
+
+                # Re-anchor transformed layouts at the top-left of their bounding box
+                if positions:
+                    min_x = min(x for x, _ in positions)
+                    min_y = min(y for _, y in positions)
+                    positions = [(x - min_x, y - min_y) for x, y in positions]
+                self.layouts.append(BlueprintLayout(components, positions))
+
 class Blueprint:
     def __init__(self, name, components):
         self.name = name
         self.components = components  # list of {"type": str, "pos": (x, y)}
 
+    @property
+    def components(self):
+        return self.layout.components
+
+    @components.setter
+    def components(self, components):
+        self.compiled = CompiledBlueprint(components)
+        self.orientation = 0
+        self.layout = self.compiled.layouts[0]
+
+    def set_orientation(self, orientation):
+        self.orientation = orientation
+        self.layout = self.compiled.layouts[orientation]
+
     def to_dict(self):
         return {
             "components": [
@@ -22,46 +111,47 @@ class Blueprint:
         }
 
     def can_place_at(self, grid, grid_x, grid_y):
-        for comp in self.components:
-            cx, cy = comp["pos"]
-            tx, ty = grid_x + cx, grid_y + cy
+        layout = self.layout
+        if not layout.fits(len(grid[0]), len(grid), grid_x, grid_y):
+            return False
 
-            if not (0 <= tx < GRID_WIDTH and 0 <= ty < GRID_HEIGHT):
-                return False
-
-            tile = grid[ty][tx]
-            comp_data = COMPONENT_DATA.get(comp["type"], {})
-            color = tuple(comp_data.get("color", (100, 100, 100)))
-            size = tuple(comp_data.get("size", [1, 1]))
-            valid_tile_types = comp_data.get("valid_tile_types", [])
-            valid_subtypes = comp_data.get("valid_subtypes", [])
-
-            virtual_comp = Component(comp["type"], color, size, valid_tile_types, valid_subtypes)
-
-            if not tile.is_placeable_by(virtual_comp):
+        for cx, cy, comp in layout.placements:
+            if not grid[grid_y + cy][grid_x + cx].is_placeable_by(comp):
                 return False
 
         return True
 
-    def instantiate(self, grid, grid_x, grid_y):
+    def check_placement(self, grid, grid_x, grid_y):
+        # Yields (tile_x, tile_y, component, valid) for every component
+        grid_h, grid_w = len(grid), len(grid[0])
+        for cx, cy, comp in self.layout.placements:
+            tx, ty = grid_x + cx, grid_y + cy
+            if 0 <= tx < grid_w and 0 <= ty < grid_h:
+                yield tx, ty, comp, grid[ty][tx].is_placeable_by(comp)
+            else:
+                yield tx, ty, comp, False
+
+    def instantiate(self, grid, grid_x, grid_y, registry=None):
         if not self.can_place_at(grid, grid_x, grid_y):
             print(f"[Blueprint] Invalid placement at ({grid_x}, {grid_y})")
-            return
+            return None
         
         group_id = str(uuid.uuid4())  # unique per blueprint placement
+        grid_h, grid_w = len(grid), len(grid[0])
 
-        for comp in self.components:
-            cx, cy = comp["pos"]
+        for cx, cy, comp in self.layout.placements:
             tx = grid_x + cx
             ty = grid_y + cy
 
-            if 0 <= tx < GRID_WIDTH and 0 <= ty < GRID_HEIGHT:
+            if 0 <= tx < grid_w and 0 <= ty < grid_h:
                 tile = grid[ty][tx]
                 if tile.building is None:
-                    comp_data = COMPONENT_DATA.get(comp["type"], {})
-                    color = tuple(comp_data.get("color", (100, 100, 100)))
-                    building = Building(comp["type"], color, group_id=group_id)
+                    building = Building(comp.name, comp.color, group_id=group_id)
                     tile.set_occupied(building)
+                    if registry is not None:
+                        registry.add(building, tx, ty)
+
+        return group_id
 
     def save_to_file(self, path):
         if not self.components:
@@ -85,16 +175,19 @@ class Blueprint:
             "components": normalized
         }
 
+        # Written aside and swapped in, so readers never see a half-written file
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w") as f:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
         print(f"[Blueprint] Saved to {path}")
 
     def draw_preview(self, screen, grid_x, grid_y, cam_x, cam_y, zoom, offset_y, grid=None):
         tile_px = TILE_SIZE * zoom
+        grid_h, grid_w = (len(grid), len(grid[0])) if grid else (GRID_HEIGHT, GRID_WIDTH)
 
-        for comp in self.components:
-            cx, cy = comp["pos"]
+        for cx, cy, comp in self.layout.placements:
             tx = grid_x + cx
             ty = grid_y + cy
 
@@ -103,64 +196,25 @@ class Blueprint:
 
             # --- Check tile status
             invalid = False
-            if not (0 <= tx < GRID_WIDTH and 0 <= ty < GRID_HEIGHT):
+            if not (0 <= tx < grid_w and 0 <= ty < grid_h):
+                invalid = True
+            elif grid and not grid[ty][tx].is_placeable_by(comp):
                 invalid = True
-            elif grid:
-                comp_data = COMPONENT_DATA.get(comp["type"], {})
-                color = tuple(comp_data.get("color", (100, 100, 100)))
-                size = tuple(comp_data.get("size", [1, 1]))
-                valid_tile_types = comp_data.get("valid_tile_types", [])
-                valid_subtypes = comp_data.get("valid_subtypes", [])
-                virtual_comp = Component(comp["type"], color, size, valid_tile_types, valid_subtypes)
-
-                if not grid[ty][tx].is_placeable_by(virtual_comp):
-                    invalid = True
 
             # --- Draw red or green highlight underlay
-            tile_highlight = pygame.Surface((tile_px, tile_px), pygame.SRCALPHA)
-            tile_highlight.fill((255, 0, 0, 80) if invalid else (0, 255, 0, 60))
-            screen.blit(tile_highlight, (int(px), int(py)))
+            tile_highlight = SPRITES.tint((255, 0, 0, 80) if invalid else (0, 255, 0, 60), zoom)
+            screen.blit(tile_highlight, (math.floor(px), math.floor(py)))
 
             # --- Draw component ghost
-            color = tuple(COMPONENT_DATA.get(comp["type"], {}).get("color", (100, 100, 100)))
-            size = tuple(COMPONENT_DATA.get(comp["type"], {}).get("size", [1, 1]))
-
-            width = size[0] * tile_px - int(8 * zoom)
-            height = size[1] * tile_px - int(8 * zoom)
             offset = int(4 * zoom)
-
-            surf = pygame.Surface((width, height), pygame.SRCALPHA)
-            surf.fill(color + (200,))
-            screen.blit(surf, (int(px) + offset, int(py) + offset))
+            surf = SPRITES.body(comp.color, zoom, comp.size, alpha=200)
+            screen.blit(surf, (math.floor(px) + offset, math.floor(py) + offset))
 
     def rotate_90(self):
-        if not self.components:
-            return
-
-        max_x = max(comp["pos"][0] for comp in self.components)
-        max_y = max(comp["pos"][1] for comp in self.components)
-
-        self.components = [
-            {"type": comp["type"], "pos": (max_y - comp["pos"][1], comp["pos"][0])}
-            for comp in self.components
-        ]
+        self.set_orientation(ROTATE_90[self.orientation])
 
     def flip_horizontal(self):
-        if not self.components:
-            return
-
-        max_x = max(comp["pos"][0] for comp in self.components)
-
-        for comp in self.components:
-            x, y = comp["pos"]
-            comp["pos"] = (max_x - x, y)
+        self.set_orientation(FLIP_HORIZONTAL[self.orientation])
 
     def flip_vertical(self):
-        if not self.components:
-            return
-
-        max_y = max(comp["pos"][1] for comp in self.components)
-
-        for comp in self.components:
-            x, y = comp["pos"]
-            comp["pos"] = (x, max_y - y)
\ No newline at end of file
+        self.set_orientation(FLIP_VERTICAL[self.orientation])
@@ -0,0 +1,143 @@
+import json
+import os
+from systems.blueprint import Blueprint
+
+INDEX_FILE = ".index.json"
+INDEX_VERSION = 1
+
+class LazyBlueprint(Blueprint):
+    """Blueprint known by its index entry; the component list is read the first time it is used."""
+
+    def __init__(self, path, entry, on_error=None):
+        self.path = path
+        self.on_error = on_error
+        self.name = entry["name"]
+        self.size = tuple(entry["size"])
+        self.bbox = tuple(entry["bbox"])
+        self.count = entry["count"]
+
+    def __getattr__(self, attr):
+        # Only reached while the layouts are missing, i.e. before the first load
+        if attr in ("compiled", "layout", "orientation"):
+            self.load()
+            return self.__dict__[attr]
+        raise AttributeError(attr)
+
+    def load(self):
+        # The file may have been deleted or broken since it was indexed; the
+        # blueprint then places nothing and the library drops it on the next refresh
+        try:
+            with open(self.path) as f:
+                components = json.load(f).get("components", [])
+            self.components = components
+        except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"[ERROR] Failed to load blueprint '{os.path.basename(self.path)}': {e}")
+            self.components = []
+            if self.on_error:
+                self.on_error(os.path.basename(self.path))
+
+def index_entry(path, stat):
+    with open(path) as f:
+        data = json.load(f)
+
+    components = data.get("components", [])
+    xs = [comp["pos"][0] for comp in components] or [0]
+    ys = [comp["pos"][1] for comp in components] or [0]
+    return {
+        "mtime": stat.st_mtime_ns,
+        "bytes": stat.st_size,
+        "name": data.get("name", os.path.splitext(os.path.basename(path))[0]),
+        "count": len(components),
+        "size": [max(xs) - min(xs) + 1, max(ys) - min(ys) + 1],
+        "bbox": [min(xs), min(ys), max(xs), max(ys)],
+    }
+
+class BlueprintLibrary:
+    """Saved blueprints in a folder, backed by an index so unchanged files are never reparsed."""
+
+    def __init__(self, folder="data/blueprints"):
+        self.folder = folder
+        self.index_path = os.path.join(folder, INDEX_FILE)
+        self.entries = self.read_index()     # filename -> index entry
+        self.blueprints = {}                 # filename -> LazyBlueprint
+        self.failed = set()                  # filenames that failed to load after indexing
+        self.needs_refresh = False
+
+    def read_index(self):
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return index.get("files", {}) if index.get("version") == INDEX_VERSION else {}
+
+    def write_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": INDEX_VERSION, "files": self.entries}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self):
+        """Picks up new, changed and deleted files; returns the blueprint list."""
+        changed = False
+        seen = set()
+        failed, self.failed = self.failed, set()
+
+        for item in os.scandir(self.folder):
+            if not item.name.endswith(".json") or item.name == INDEX_FILE:
+                continue
+            seen.add(item.name)
+
+            stat = item.stat()
+            entry = self.entries.get(item.name)
+            if (entry and item.name not in failed and
+                    entry["mtime"] == stat.st_mtime_ns and entry["bytes"] == stat.st_size):
+                continue
+
+            # Broken and empty files stay indexed with no components, so they are
+            # only reported again once they change
+            try:
+                entry = index_entry(item.path, stat)
+            except Exception as e:
+                print(f"[ERROR] Failed to load blueprint '{item.name}': {e}")
+                entry = {"mtime": stat.st_mtime_ns, "bytes": stat.st_size, "name": item.name,
+                         "count": 0, "size": [0, 0], "bbox": [0, 0, 0, 0]}
+            else:
+                if not entry["count"]:
+                    print(f"[WARN] Skipped blueprint '{item.name}' — no components found.")
+
+            self.entries[item.name] = entry
+            self.blueprints.pop(item.name, None)
+            changed = True
+
+        for filename in set(self.entries) - seen:
+            del self.entries[filename]
+            self.blueprints.pop(filename, None)
+            changed = True
+
+        if changed:
+            try:
+                self.write_index()
+            except OSError as e:
+                print(f"[WARN] Could not write blueprint index: {e}")
+
+        return self.items()
+
+    def items(self):
+        blueprints = []
+        for filename in sorted(self.entries):
+            entry = self.entries[filename]
+            if not entry["count"]:
+                continue
+            if filename not in self.blueprints:
+                self.blueprints[filename] = LazyBlueprint(os.path.join(self.folder, filename), entry, self.load_failed)
+            blueprints.append(self.blueprints[filename])
+        return blueprints
+
+    def load_failed(self, filename):
+        # The next refresh re-indexes the file even if it looks unchanged
+        self.failed.add(filename)
+        self.needs_refresh = True
+
+    def get(self, name):
+        return next((blueprint for blueprint in self.items() if blueprint.name == name), None)
@@ -1,6 +1,6 @@
-import pygame
 import json
 from settings import TILE_SIZE
+from systems.sprites import SPRITES
 
 # Load recipes once globally
 with open("data/buildings.json") as f:
@@ -11,39 +11,73 @@ class Building:
         self.name = name
         self.color = color
         self.recipe = RECIPES.get(name, {})
-        self.timer = 0
+        self._timer = 0
         self.active = False
         self.group_id = group_id
-        
-        # Placeholders for future use
-        self.input_buffer = {}
-        self.output_buffer = {}
+
+        # Item counts waiting to be consumed / produced by the recipe
+        self._input_buffer = {}
+        self._output_buffer = {}
+
+        # Set while a RecipeScheduler is driving this building
+        self.scheduler = None
+        self.due = None
+
+        # Set while a BatchSimulation holds this building's state in its arrays
+        self.batch = None
+        self.slot = None
+
+    @property
+    def timer(self):
+        if self.batch is not None:
+            return float(self.batch.timers[self.slot])
+        return self._timer
+
+    @timer.setter
+    def timer(self, value):
+        if self.batch is not None:
+            self.batch.timers[self.slot] = value
+        else:
+            self._timer = value
+
+    @property
+    def input_buffer(self):
+        # Read-only snapshot while batched; use receive() to add items
+        if self.batch is not None:
+            return {**self._input_buffer, **self.batch.item_counts(self.slot, outputs=False)}
+        return self._input_buffer
+
+    @property
+    def output_buffer(self):
+        if self.batch is not None:
+            return {**self._output_buffer, **self.batch.item_counts(self.slot, outputs=True)}
+        return self._output_buffer
 
     def draw(self, screen, grid_x, grid_y, cam_x, cam_y, zoom, offset_y):
         tile_px = TILE_SIZE * zoom
         px = grid_x * tile_px - cam_x
         py = grid_y * tile_px - cam_y + offset_y
 
-        size = tile_px - int(8 * zoom)
         offset = int(4 * zoom)
-
-        pygame.draw.rect(
-            screen,
-            self.color,
-            (int(px) + offset, int(py) + offset, size, size)
-        )
-
-    def update(self, dt):
-        if self.can_process():
-            self.timer += dt
-            if self.timer >= self.recipe.get("process_time", float("inf")):
-                self.process()
-                self.timer = 0
-        else:
-            self.timer = 0
+        screen.blit(SPRITES.body(self.color, zoom), (int(px) + offset, int(py) + offset))
 
     def can_process(self):
-        return bool(self.recipe.get("inputs")) and bool(self.recipe.get("outputs"))
+        inputs = self.recipe.get("inputs")
+        if not inputs or not self.recipe.get("outputs"):
+            return False
+        return all(self.input_buffer.get(item, 0) >= count for item, count in inputs.items())
+
+    def receive(self, item, count=1):
+        if self.batch is not None and item in self.batch.input_items:
+            self.batch.receive(self.slot, item, count)
+            return
+
+        self._input_buffer[item] = self._input_buffer.get(item, 0) + count
+        if self.scheduler is not None:
+            self.scheduler.wake(self)
 
     def process(self):
-        print(f"{self.name} processed: {self.recipe.get('inputs')} → {self.recipe.get('outputs')}")
+        for item, count in self.recipe["inputs"].items():
+            self.input_buffer[item] -= count
+        for item, count in self.recipe["outputs"].items():
+            self.output_buffer[item] = self.output_buffer.get(item, 0) + count
@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+from settings import WORLD_CHUNK_SIZE
+from systems.tile import Tile
+
+class WorldChunk:
+    def __init__(self, tiles):
+        self.tiles = tiles          # rows of Tile, local coordinates
+        self.modified = False       # differs from what the generator would produce
+
+class ChunkedRow:
+    def __init__(self, store, y):
+        self.store = store
+        self.y = y
+
+    def __len__(self):
+        return self.store.width
+
+    def __getitem__(self, x):
+        return self.store.tile(x, self.y)
+
+    def __setitem__(self, x, tile):
+        size = self.store.chunk_size
+        chunk = self.store.chunk(x // size, self.y // size)
+        chunk.tiles[self.y % size][x % size] = tile
+        chunk.modified = True
+        if self.store.owner is not None:
+            tile.attach(self.store.owner, x, self.y)
+            tile.mark_changed()
+
+class ChunkedGrid:
+    """Grid of lazily generated chunks; grid[y][x] creates the chunk on first access.
+
+    Chunks far from the camera are dropped, and written to disk first if they
+    were modified, so memory follows the explored area rather than the map size.
+    """
+
+    def __init__(self, width, height, generate_chunk, resolve_building=None, chunk_size=WORLD_CHUNK_SIZE):
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.generate_chunk = generate_chunk            # (x0, y0, w, h) -> rows of Tile
+        self.resolve_building = resolve_building        # (group_id, x, y) -> building
+        self.owner = None
+
+        self.chunks = {}            # (cx, cy) -> WorldChunk
+        self.saved = set()          # chunk keys evicted to disk
+        self.spill_dir = tempfile.TemporaryDirectory(prefix="pysim_chunks_")
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        return ChunkedRow(self, y)
+
+    def tile(self, x, y):
+        size = self.chunk_size
+        return self.chunk(x // size, y // size).tiles[y % size][x % size]
+
+    def chunk(self, cx, cy):
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            chunk = self.load_chunk(cx, cy) if (cx, cy) in self.saved else self.create_chunk(cx, cy)
+            self.chunks[(cx, cy)] = chunk
+            self.attach_chunk(cx, cy, chunk)
+        return chunk
+
+    def chunk_bounds(self, cx, cy):
+        x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+        return x0, y0, min(self.chunk_size, self.width - x0), min(self.chunk_size, self.height - y0)
+
+    def create_chunk(self, cx, cy):
+        return WorldChunk(self.generate_chunk(*self.chunk_bounds(cx, cy)))
+
+    def attach_chunk(self, cx, cy, chunk):
+        if self.owner is None:
+            return
+        x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+        for ly, row in enumerate(chunk.tiles):
+            for lx, tile in enumerate(row):
+                tile.attach(self.owner, x0 + lx, y0 + ly)
+
+    def attach(self, owner):
+        self.owner = owner
+        for (cx, cy), chunk in self.chunks.items():
+            self.attach_chunk(cx, cy, chunk)
+
+    def tile_changed(self, x, y):
+        chunk = self.chunks.get((x // self.chunk_size, y // self.chunk_size))
+        if chunk is not None:
+            chunk.modified = True
+
+    # --- Eviction
+    def chunk_path(self, cx, cy):
+        return os.path.join(self.spill_dir.name, f"{cx}_{cy}.json")
+
+    def save_chunk(self, cx, cy, chunk):
+        tiles = [
+            [tile.tile_type, tile.subtype, tile.state, getattr(tile.building, "group_id", None)]
+            for row in chunk.tiles for tile in row
+        ]
+        with open(self.chunk_path(cx, cy), "w") as f:
+            json.dump({"tiles": tiles}, f)
+        self.saved.add((cx, cy))
+
+    def load_chunk(self, cx, cy):
+        with open(self.chunk_path(cx, cy)) as f:
+            data = json.load(f)
+
+        x0, y0, w, h = self.chunk_bounds(cx, cy)
+        rows = []
+        for ly in range(h):
+            row = []
+            for lx in range(w):
+                tile_type, subtype, state, group_id = data["tiles"][ly * w + lx]
+                tile = Tile(tile_type, subtype)
+                tile.state = state
+                if group_id is not None and self.resolve_building:
+                    tile.building = self.resolve_building(group_id, x0 + lx, y0 + ly)
+                row.append(tile)
+            rows.append(row)
+
+        chunk = WorldChunk(rows)
+        chunk.modified = True
+        return chunk
+
+    def evict_far(self, x, y, radius):
+        # Drop chunks more than `radius` chunks away from tile (x, y)
+        ccx, ccy = x // self.chunk_size, y // self.chunk_size
+        for key in list(self.chunks):
+            cx, cy = key
+            if abs(cx - ccx) <= radius and abs(cy - ccy) <= radius:
+                continue
+
+            chunk = self.chunks.pop(key)
+            if chunk.modified:
+                self.save_chunk(cx, cy, chunk)
+            for row in chunk.tiles:
+                for tile in row:
+                    tile.owner = None
+
+    def building_positions(self):
+        positions = []
+        for (cx, cy), chunk in self.chunks.items():
+            x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+            for ly, row in enumerate(chunk.tiles):
+                for lx, tile in enumerate(row):
+                    if tile.building:
+                        positions.append((x0 + lx, y0 + ly))
+        return sorted(positions, key=lambda pos: (pos[1], pos[0]))
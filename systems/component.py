@@ -1,5 +1,5 @@
-import pygame
 from settings import TILE_SIZE
+from systems.sprites import SPRITES
 
 class Component:
     def __init__(self, name, color, size=(1, 1), valid_tile_types=None, valid_subtypes=None):
@@ -17,15 +17,5 @@ class Component:
         px = grid_x * tile_px - cam_x
         py = grid_y * tile_px - cam_y + offset_y
 
-        width = self.size[0] * tile_px - int(8 * zoom)
-        height = self.size[1] * tile_px - int(8 * zoom)
         offset = int(4 * zoom)
-
-        rect = pygame.Rect(
-            int(px) + offset,
-            int(py) + offset,
-            int(width),
-            int(height)
-        )
-
-        pygame.draw.rect(screen, self.color, rect)
\ No newline at end of file
+        screen.blit(SPRITES.body(self.color, zoom, tuple(self.size)), (int(px) + offset, int(py) + offset))
\ No newline at end of file
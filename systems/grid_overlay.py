@@ -0,0 +1,44 @@
+import pygame
+from settings import BLUEPRINT_BG
+
+COLORKEY = (255, 0, 255)
+
+class GridOverlay:
+    """Grid lines pre-rendered into one transparent layer, one tile larger than the view.
+
+    The pattern repeats every tile, so panning is just a different source
+    offset into the layer; it is only redrawn when the zoom or screen size changes.
+    """
+
+    def __init__(self, color=BLUEPRINT_BG):
+        self.color = color
+        self.key = None
+        self.layer = None
+
+    def invalidate(self):
+        self.key = self.layer = None
+
+    def render(self, scaled_tile, width, height):
+        layer = pygame.Surface((width + scaled_tile, height + scaled_tile))
+        layer.fill(COLORKEY)
+        layer.set_colorkey(COLORKEY)
+
+        for px in range(0, width + scaled_tile, scaled_tile):
+            pygame.draw.line(layer, self.color, (px, 0), (px, height + scaled_tile))
+        for py in range(0, height + scaled_tile, scaled_tile):
+            pygame.draw.line(layer, self.color, (0, py), (width + scaled_tile, py))
+        return layer
+
+    def draw(self, screen, viewport):
+        width = screen.get_width()
+        height = screen.get_height() - viewport.offset_top
+        key = (viewport.scaled_tile, width, height)
+        if key != self.key:
+            self.layer = self.render(viewport.scaled_tile, width, height)
+            self.key = key
+
+        # Lines sit on tile edges, rounded exactly like Viewport.to_screen places the tiles
+        origin_x, origin_y = viewport.to_screen(0, 0)
+        scaled_tile = viewport.scaled_tile
+        area = pygame.Rect(-origin_x % scaled_tile, (viewport.offset_top - origin_y) % scaled_tile, width, height)
+        screen.blit(self.layer, (0, viewport.offset_top), area)
@@ -0,0 +1,82 @@
+import queue
+import threading
+
+class IOResult:
+    def __init__(self, kind, key, value=None, error=None):
+        self.kind = kind
+        self.key = key
+        self.value = value
+        self.error = error
+
+class IOWorker:
+    """Runs file I/O jobs in order on one background thread; finished jobs are collected with poll().
+
+    Jobs with the same key (e.g. the file path) never run concurrently. A job
+    that has not started yet is cancelled when a newer one with the same key is
+    submitted, and the newer one goes to the back of the queue, so it still runs
+    after anything that was submitted in between.
+
+    With synchronous=True (replays) jobs run inside submit(), so their results
+    arrive on the same frame every time.
+    """
+
+    def __init__(self, synchronous=False):
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = {}     # key -> queued job that has not started yet
+        self.lock = threading.Lock()
+        self.synchronous = synchronous
+        self.thread = None
+        if not synchronous:
+            self.thread = threading.Thread(target=self.run, name="io-worker", daemon=True)
+            self.thread.start()
+
+    def submit(self, kind, fn, *args, key=None):
+        if self.synchronous:
+            self.results.put(self.execute(kind, key, fn, args))
+            return
+
+        job = {"kind": kind, "key": key, "fn": fn, "args": args, "cancelled": False}
+        with self.lock:
+            if key is not None:
+                queued = self.pending.get(key)
+                if queued is not None:
+                    queued["cancelled"] = True
+                self.pending[key] = job
+        self.jobs.put(job)
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+
+            with self.lock:
+                if job["cancelled"]:
+                    continue
+                kind, key = job["kind"], job["key"]
+                if key is not None:
+                    self.pending.pop(key, None)
+
+            self.results.put(self.execute(kind, key, job["fn"], job["args"]))
+
+    def execute(self, kind, key, fn, args):
+        try:
+            return IOResult(kind, key, value=fn(*args))
+        except Exception as e:
+            return IOResult(kind, key, error=e)
+
+    def poll(self):
+        results = []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def close(self, timeout=None):
+        # Finishes the queued jobs first
+        if self.thread is None:
+            return
+        self.jobs.put(None)
+        self.thread.join(timeout)
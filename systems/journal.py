@@ -0,0 +1,134 @@
+import json
+import os
+import uuid
+from collections import deque
+from settings import JOURNAL_UNDO_LIMIT
+
+def invert(delta):
+    return {"op": "remove" if delta["op"] == "place" else "place", "cells": delta["cells"]}
+
+class ChangeJournal:
+    """Undo/redo history of grid edits, optionally appended to a file for crash recovery.
+
+    A delta is {"op": "place" | "remove", "cells": [...]}; the owning grid
+    applies it with apply_delta(). Undo and redo are journaled as the delta
+    they apply, so the file can always be replayed front to back.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.undo_stack = deque(maxlen=JOURNAL_UNDO_LIMIT)
+        self.redo_stack = []
+        self.id = uuid.uuid4().hex
+        self.seq = 0
+        self.file = None
+        self.path = None
+
+    def start(self, path, snapshot=None):
+        # New journal file; recovery starts from the snapshot, or from a freshly generated world
+        self.close()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.file = open(path, "w")
+        self.file.write(json.dumps({
+            "journal": self.id,
+            "seq": self.seq,
+            "snapshot": snapshot,
+            "width": self.grid.width,
+            "height": self.grid.height,
+            "seed": getattr(self.grid, "seed", None),
+        }) + "\n")
+        self.file.flush()
+
+    def resume(self, path, journal_id, seq):
+        # Keep appending to a journal that was just replayed
+        self.close()
+        self.id, self.seq = journal_id, seq
+        self.path = path
+        self.file = open(path, "a")
+
+    def close(self, discard=False):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            if discard:
+                os.remove(self.path)
+
+    def record(self, delta):
+        if not delta["cells"]:
+            return
+        self.undo_stack.append(delta)
+        self.redo_stack.clear()
+        self.write(delta)
+
+    def undo(self):
+        if not self.undo_stack:
+            return False
+        delta = self.undo_stack.pop()
+        inverse = invert(delta)
+        self.grid.apply_delta(inverse)
+        self.redo_stack.append(delta)
+        self.write(inverse)
+        return True
+
+    def redo(self):
+        if not self.redo_stack:
+            return False
+        delta = self.redo_stack.pop()
+        self.grid.apply_delta(delta)
+        self.undo_stack.append(delta)
+        self.write(delta)
+        return True
+
+    def write(self, delta):
+        self.seq += 1
+        if self.file is not None:
+            self.file.write(json.dumps({"seq": self.seq, **delta}, separators=(",", ":")) + "\n")
+            self.file.flush()
+
+def read_journal(path):
+    """Returns (header, deltas); a torn last line from a crash is ignored."""
+    header, deltas = None, []
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if header is None:
+                header = record
+            else:
+                deltas.append(record)
+    return header, deltas
+
+def recover_world(path, snapshot_paths=()):
+    """Rebuild the world of an unfinished session from its journal, or None if there is nothing to recover."""
+    from modes.play_mode import World
+    from systems.savegame import load_world, read_meta
+
+    try:
+        header, deltas = read_journal(path)
+    except OSError:
+        return None
+    if header is None or not deltas:
+        return None
+
+    # A snapshot saved later in the same session replaces the journal's base
+    base, seq = header["snapshot"], header["seq"]
+    for snapshot in snapshot_paths:
+        meta = read_meta(snapshot)
+        if meta and meta.get("journal_id") == header["journal"] and meta["journal_seq"] >= seq:
+            base, seq = snapshot, meta["journal_seq"]
+
+    if base is not None:
+        world = load_world(base)
+    else:
+        world = World(header["width"], header["height"], seed=header["seed"])
+
+    for delta in deltas:
+        if delta["seq"] > seq:
+            world.apply_delta(delta)
+
+    world.journal.resume(path, header["journal"], deltas[-1]["seq"])
+    print(f"[Journal] Recovered {sum(d['seq'] > seq for d in deltas)} changes from {path}")
+    return world
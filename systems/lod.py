@@ -0,0 +1,90 @@
+import numpy as np
+import pygame
+from settings import MINIMAP_BORDER_COLOR, MINIMAP_VIEW_COLOR
+from systems.array_grid import ArrayGrid
+from systems.tile import base_color
+
+class TileColorRaster:
+    """One pixel per tile, coloured like Tile.get_color without highlights.
+
+    Built once with surfarray and kept in sync through tile_changed, so
+    zoomed-out views and the minimap are a single scale + blit of this surface.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.surface = None
+        self.version = 0
+        self.view_key = self.view_surface = None
+        self.minimap_key = self.minimap_surface = None
+
+    def rebuild(self):
+        grid = self.owner.grid
+        if isinstance(grid, ArrayGrid):
+            # Colour lookup table indexed by (tile_type code, subtype code)
+            lut = np.array([
+                [base_color(tile_type, subtype) for subtype in grid.subtypes]
+                for tile_type in grid.tile_types
+            ], dtype=np.uint8)
+            colors = lut[grid.tile_type, grid.subtype]
+            colors[grid.occupied] = base_color(None, None, has_building=True)
+        else:
+            colors = np.array([
+                [base_color(tile.tile_type, tile.subtype, tile.building is not None) for tile in row]
+                for row in grid
+            ], dtype=np.uint8)
+
+        # surfarray is indexed [x, y]
+        self.surface = pygame.Surface((self.owner.width, self.owner.height))
+        pygame.surfarray.blit_array(self.surface, colors.transpose(1, 0, 2))
+        self.version += 1
+
+    def ensure(self):
+        if self.surface is None:
+            self.rebuild()
+        return self.surface
+
+    def tile_changed(self, x, y):
+        if self.surface is None:
+            return
+        tile = self.owner.grid[y][x]
+        self.surface.set_at((x, y), base_color(tile.tile_type, tile.subtype, tile.building is not None))
+        self.version += 1
+
+    def draw(self, screen, viewport):
+        # Only the visible tiles are scaled, so the cost follows the screen size, not the map size
+        x0, y0 = viewport.first_x, viewport.first_y
+        x1, y1 = viewport.last_x + 1, viewport.last_y + 1
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        tile_px = viewport.tile_px
+        key = (x0, y0, x1, y1, tile_px, self.version)
+        if key != self.view_key:
+            area = self.ensure().subsurface((x0, y0, x1 - x0, y1 - y0))
+            size = (max(1, round((x1 - x0) * tile_px)), max(1, round((y1 - y0) * tile_px)))
+            self.view_surface = pygame.transform.scale(area, size)
+            self.view_key = key
+
+        screen.blit(self.view_surface, viewport.to_screen(x0 * tile_px, y0 * tile_px))
+
+    def draw_minimap(self, screen, rect, viewport):
+        width, height = self.owner.width, self.owner.height
+        scale = min(rect.width / width, rect.height / height)
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        key = (size, self.version)
+        if key != self.minimap_key:
+            self.minimap_surface = pygame.transform.smoothscale(self.ensure(), size)
+            self.minimap_key = key
+
+        screen.blit(self.minimap_surface, rect.topleft)
+        pygame.draw.rect(screen, MINIMAP_BORDER_COLOR, (rect.x, rect.y, size[0], size[1]), 1)
+
+        # Camera rectangle in minimap pixels
+        view_x = viewport.camera_x / viewport.tile_px * scale
+        view_y = viewport.camera_y / viewport.tile_px * scale
+        view_w = viewport.view_w / viewport.tile_px * scale
+        view_h = viewport.view_h / viewport.tile_px * scale
+        view = pygame.Rect(rect.x + int(view_x), rect.y + int(view_y), max(2, int(view_w)), max(2, int(view_h)))
+        pygame.draw.rect(screen, MINIMAP_VIEW_COLOR, view.clip((rect.x, rect.y, size[0], size[1])), 1)
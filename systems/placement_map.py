@@ -0,0 +1,190 @@
+import numpy as np
+import pygame
+from settings import PLACEMENT_MAP_COLOR, PLACEMENT_MAP_ALPHA, WORLD_CHUNK_SIZE
+from systems.array_grid import ArrayGrid
+from systems.chunked_grid import ChunkedGrid
+
+class PlacementMap:
+    """Every anchor where the selected blueprint can be placed, found with array ops."""
+
+    def __init__(self, world):
+        self.world = world
+        self.codes = None           # (tile_type index << 8 | subtype index) per tile
+        self.occupied = None
+        self.origin = (0, 0)        # world tile at codes[0, 0]
+        self.tile_types = []
+        self.subtypes = []
+        self.masks = {}             # component name -> (allowed codes, bool array of placeable tiles)
+
+        # Last computed anchors, refreshed only where tiles changed
+        self.layout = None
+        self.region = None
+        self.valid = None
+        self.stale = []
+
+    # --- Raster of the world grid
+    def encode(self, tile_type, subtype):
+        for table, value in ((self.tile_types, tile_type), (self.subtypes, subtype)):
+            if value not in table:
+                table.append(value)
+                self.masks.clear()
+        return self.tile_types.index(tile_type) << 8 | self.subtypes.index(subtype)
+
+    def build_raster(self, x0=0, y0=0, x1=None, y1=None):
+        grid = self.world.grid
+        self.origin = (x0, y0)
+        if isinstance(grid, ChunkedGrid):
+            # Unbounded worlds are rastered only around the area being looked at
+            self.codes = np.zeros((y1 - y0, x1 - x0), dtype=np.uint16)
+            self.occupied = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+            for y in range(y0, y1):
+                row = grid[y]
+                for x in range(x0, x1):
+                    tile = row[x]
+                    self.codes[y - y0, x - x0] = self.encode(tile.tile_type, tile.subtype)
+                    self.occupied[y - y0, x - x0] = not tile.is_clear()
+        elif isinstance(grid, ArrayGrid):
+            self.tile_types = list(grid.tile_types)
+            self.subtypes = list(grid.subtypes)
+            self.codes = grid.tile_type.astype(np.uint16) << 8 | grid.subtype
+            self.occupied = grid.occupied | (grid.building_id >= 0)
+        else:
+            shape = (self.world.height, self.world.width)
+            self.codes = np.zeros(shape, dtype=np.uint16)
+            self.occupied = np.zeros(shape, dtype=bool)
+            for y, row in enumerate(grid):
+                for x, tile in enumerate(row):
+                    self.codes[y, x] = self.encode(tile.tile_type, tile.subtype)
+                    self.occupied[y, x] = not tile.is_clear()
+        self.masks.clear()
+
+    def tile_changed(self, x, y):
+        if self.codes is None:
+            return
+
+        rx, ry = x - self.origin[0], y - self.origin[1]
+        height, width = self.codes.shape
+        if not (0 <= rx < width and 0 <= ry < height):
+            return
+
+        tile = self.world.grid[y][x]
+        code = self.encode(tile.tile_type, tile.subtype)
+        self.codes[ry, rx] = code
+        self.occupied[ry, rx] = not tile.is_clear()
+
+        for allowed, mask in self.masks.values():
+            mask[ry, rx] = code in allowed and not self.occupied[ry, rx]
+
+        if self.layout is not None:
+            # Anchors whose footprint covers this tile
+            layout = self.layout
+            self.stale.append((
+                x - layout.max_x, y - layout.max_y,
+                x - layout.min_x + 1, y - layout.min_y + 1
+            ))
+
+    def allowed_codes(self, comp):
+        return {
+            t << 8 | s
+            for t, tile_type in enumerate(self.tile_types)
+            if tile_type in comp.valid_tile_types
+            for s, subtype in enumerate(self.subtypes)
+            if not comp.valid_subtypes or subtype in comp.valid_subtypes
+        }
+
+    def mask_for(self, comp):
+        entry = self.masks.get(comp.name)
+        if entry is None:
+            allowed = self.allowed_codes(comp)
+            mask = np.isin(self.codes, np.fromiter(allowed, dtype=np.uint16)) & ~self.occupied
+            entry = self.masks[comp.name] = (allowed, mask)
+        return entry[1]
+
+    # --- Anchor computation
+    def compute(self, x0, y0, x1, y1):
+        # Valid anchors in [x0, x1) x [y0, y1) for the current layout
+        ox, oy = self.origin
+        height, width = self.codes.shape
+        valid = np.ones((y1 - y0, x1 - x0), dtype=bool)
+
+        for dx, dy, comp in self.layout.placements:
+            mask = self.mask_for(comp)
+
+            # Intersect the shifted window with the raster; anything outside is invalid
+            sx0, sy0 = max(x0 + dx, ox), max(y0 + dy, oy)
+            sx1, sy1 = min(x1 + dx, ox + width), min(y1 + dy, oy + height)
+            covered = np.zeros_like(valid)
+            if sx0 < sx1 and sy0 < sy1:
+                covered[sy0 - y0 - dy:sy1 - y0 - dy, sx0 - x0 - dx:sx1 - x0 - dx] = mask[sy0 - oy:sy1 - oy, sx0 - ox:sx1 - ox]
+            valid &= covered
+
+        return valid
+
+    def covers(self, x0, y0, x1, y1):
+        ox, oy = self.origin
+        height, width = self.codes.shape
+        return ox <= x0 and oy <= y0 and x1 <= ox + width and y1 <= oy + height
+
+    def ensure_raster(self, layout, region):
+        if not isinstance(self.world.grid, ChunkedGrid):
+            if self.codes is None:
+                self.build_raster()
+            return False
+
+        # Tiles under every anchor's footprint must be in the raster
+        x0, y0, x1, y1 = region
+        needed = (x0 + layout.min_x, y0 + layout.min_y, x1 + layout.max_x, y1 + layout.max_y)
+        if self.codes is not None and self.covers(*needed):
+            return False
+
+        margin = WORLD_CHUNK_SIZE
+        self.build_raster(
+            max(0, needed[0] - margin), max(0, needed[1] - margin),
+            min(self.world.width, needed[2] + margin), min(self.world.height, needed[3] + margin)
+        )
+        return True
+
+    def update(self, layout, region):
+        rebuilt = self.ensure_raster(layout, region)
+
+        if rebuilt or layout is not self.layout or region != self.region:
+            self.layout = layout
+            self.region = region
+            self.stale.clear()
+            self.valid = self.compute(*region)
+            return self.valid
+
+        # Recompute only the anchor windows touched by tile changes
+        rx0, ry0, rx1, ry1 = region
+        for x0, y0, x1, y1 in self.stale:
+            x0, y0 = max(x0, rx0), max(y0, ry0)
+            x1, y1 = min(x1, rx1), min(y1, ry1)
+            if x0 < x1 and y0 < y1:
+                self.valid[y0 - ry0:y1 - ry0, x0 - rx0:x1 - rx0] = self.compute(x0, y0, x1, y1)
+        self.stale.clear()
+        return self.valid
+
+    def visible_region(self, viewport):
+        # Half-open anchor range of the tiles in view
+        x0, y0 = viewport.first_x, viewport.first_y
+        return x0, y0, max(x0, viewport.last_x + 1), max(y0, viewport.last_y + 1)
+
+    def draw(self, screen, blueprint, offset_y=0, offset_bottom=0):
+        viewport = self.world.viewport(offset_y, offset_bottom)
+        region = self.visible_region(viewport)
+        x0, y0, x1, y1 = region
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        valid = self.update(blueprint.layout, region)
+
+        # One pixel per anchor, scaled up to tile size and blitted once
+        pixels = np.zeros((x1 - x0, y1 - y0, 3), dtype=np.uint8)
+        pixels[valid.T] = PLACEMENT_MAP_COLOR
+        surf = pygame.surfarray.make_surface(pixels)
+        surf.set_colorkey((0, 0, 0))
+        surf.set_alpha(PLACEMENT_MAP_ALPHA)
+
+        tile_px = viewport.tile_px
+        surf = pygame.transform.scale(surf, (max(1, round((x1 - x0) * tile_px)), max(1, round((y1 - y0) * tile_px))))
+        screen.blit(surf, viewport.to_screen(x0 * tile_px, y0 * tile_px))
@@ -0,0 +1,50 @@
+import pygame
+from settings import DIRTY_RECT_UPDATES
+
+class ScreenPresenter:
+    """Tracks which screen regions changed this frame and pushes only those to the display.
+
+    Each region is described by a signature of everything drawn in it; a region
+    whose signature matches the last frame is neither redrawn nor updated. Small
+    items drawn on top of a region (the hover highlight, placement previews) are
+    tracked by their rect instead, so moving one only repaints where it was and
+    where it is now.
+    """
+
+    def __init__(self, enabled=DIRTY_RECT_UPDATES):
+        self.enabled = enabled
+        self.signatures = {}    # region name -> signature last drawn
+        self.items = {}         # item name -> (rect, signature) last drawn
+        self.rects = []
+        self.full = True
+
+    def invalidate(self):
+        # Next frame redraws and presents everything, e.g. after the window was exposed
+        self.full = True
+
+    def changed(self, name, rect, signature):
+        if self.enabled and not self.full and self.signatures.get(name) == signature:
+            return False
+        self.signatures[name] = signature
+        self.rects.append(rect)
+        return True
+
+    def moved(self, name, rect, signature):
+        # Returns the rect to repaint for this item (old and new position), or None if unchanged.
+        # One rect is drawn in a single pass, so per-frame state set while drawing is never seen twice
+        last = self.items.get(name)
+        self.items[name] = (rect, signature)
+        if self.enabled and not self.full and last == (rect, signature):
+            return None
+        if last is not None:
+            rect = rect.union(last[0])
+        self.rects.append(rect)
+        return rect
+
+    def present(self):
+        if not self.enabled or self.full:
+            pygame.display.flip()
+        elif self.rects:
+            pygame.display.update(self.rects)
+        self.rects = []
+        self.full = False
@@ -0,0 +1,95 @@
+import csv
+import os
+import time
+from collections import deque
+import pygame
+from settings import PROFILER_WINDOW, PROFILE_DIR, FPS
+
+PHASES = ["events", "update", "clear_highlight", "draw", "preview", "gui", "flip", "other"]
+
+class FrameProfiler:
+    """Times each phase of the main loop and keeps rolling percentiles."""
+
+    def __init__(self, window=PROFILER_WINDOW):
+        self.samples = {phase: deque(maxlen=window) for phase in PHASES + ["frame"]}
+        self.current = {}
+        self.frame_start = self.last = time.perf_counter()
+        self.frames = 0
+
+        self.show_details = False
+        self.csv_file = None
+        self.csv_writer = None
+
+    def begin_frame(self):
+        self.frame_start = self.last = time.perf_counter()
+        self.current = dict.fromkeys(PHASES, 0.0)
+
+    def mark(self, phase):
+        # Time since the previous mark is charged to this phase
+        now = time.perf_counter()
+        self.current[phase] += (now - self.last) * 1000
+        self.last = now
+
+    def end_frame(self):
+        total = (time.perf_counter() - self.frame_start) * 1000
+        for phase, ms in self.current.items():
+            self.samples[phase].append(ms)
+        self.samples["frame"].append(total)
+        self.frames += 1
+
+        if self.csv_writer:
+            self.csv_writer.writerow([self.frames] + [f"{self.current[p]:.3f}" for p in PHASES] + [f"{total:.3f}"])
+
+    def percentiles(self, phase):
+        values = sorted(self.samples[phase])
+        if not values:
+            return 0.0, 0.0, 0.0
+        pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+        return pick(0.50), pick(0.95), pick(0.99)
+
+    def debug_lines(self):
+        p50, p95, p99 = self.percentiles("frame")
+        lines = [f"Frame ms p50/p95/p99: {p50:.1f}/{p95:.1f}/{p99:.1f}" + (" [CSV]" if self.csv_writer else "")]
+        if self.show_details:
+            for phase in PHASES:
+                p50, p95, p99 = self.percentiles(phase)
+                lines.append(f"  {phase}: {p50:.2f}/{p95:.2f}/{p99:.2f}")
+        return lines
+
+    def toggle_csv(self, path=None):
+        if self.csv_file:
+            self.csv_file.close()
+            self.csv_file = self.csv_writer = None
+            print("[Profiler] CSV stopped")
+            return
+
+        path = path or os.path.join(PROFILE_DIR, time.strftime("profile_%Y%m%d_%H%M%S.csv"))
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.csv_file = open(path, "w", newline="")
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_writer.writerow(["frame"] + PHASES + ["total"])
+        print(f"[Profiler] Streaming samples to {path}")
+
+    def close(self):
+        if self.csv_file:
+            self.toggle_csv()
+
+    def draw_graph(self, screen, rect):
+        if not self.show_details:
+            return
+
+        pygame.draw.rect(screen, (20, 20, 20), rect)
+        pygame.draw.rect(screen, (200, 200, 200), rect, 1)
+
+        # Scale so that two frame budgets fill the graph height
+        budget = 1000 / FPS
+        scale = rect.height / (2 * budget)
+        budget_y = rect.bottom - int(budget * scale)
+        pygame.draw.line(screen, (255, 255, 0), (rect.left, budget_y), (rect.right - 1, budget_y))
+
+        frames = list(self.samples["frame"])[-rect.width:]
+        for i, ms in enumerate(frames):
+            x = rect.right - len(frames) + i
+            h = min(rect.height, int(ms * scale))
+            color = (80, 200, 80) if ms <= budget else (220, 80, 80)
+            pygame.draw.line(screen, color, (x, rect.bottom - 1), (x, rect.bottom - h))
@@ -0,0 +1,63 @@
+import heapq
+import itertools
+
+class RecipeScheduler:
+    """Wakes buildings only when their current recipe cycle completes.
+
+    Buildings that cannot process are parked until Building.receive() wakes them.
+    """
+
+    def __init__(self):
+        self.now = 0
+        self.queue = []             # (due time, sequence, building)
+        self.sequence = itertools.count()
+        self.parked = set()
+        self.completions = {}       # building name -> recipe cycles finished
+
+    def add(self, building):
+        building.scheduler = self
+        self.start(building, self.now)
+
+    def remove(self, building):
+        # Stale queue entries are skipped when popped
+        building.scheduler = None
+        building.due = None
+        building.active = False
+        self.parked.discard(building)
+
+    def wake(self, building):
+        if building in self.parked:
+            self.parked.discard(building)
+            self.start(building, self.now)
+
+    def progress(self, building):
+        # Milliseconds into the current cycle
+        if building.due is None:
+            return 0
+        return building.recipe["process_time"] - (building.due - self.now)
+
+    def start(self, building, start_time):
+        if building.can_process():
+            # Progress carried in building.timer (e.g. from a save) shortens the first cycle
+            building.due = start_time + building.recipe["process_time"] - building.timer
+            building.timer = 0
+            building.active = True
+            heapq.heappush(self.queue, (building.due, next(self.sequence), building))
+        else:
+            building.timer = 0
+            building.due = None
+            building.active = False
+            self.parked.add(building)
+
+    def advance(self, dt):
+        self.now += dt
+        queue = self.queue
+        while queue and queue[0][0] <= self.now:
+            due, _, building = heapq.heappop(queue)
+            if building.scheduler is not self or building.due != due:
+                continue
+
+            building.process()
+            self.completions[building.name] = self.completions.get(building.name, 0) + 1
+            # The next cycle starts exactly when this one finished
+            self.start(building, due)
@@ -0,0 +1,31 @@
+class BuildingRegistry:
+    """Live buildings in a world, indexed by blueprint placement and tile."""
+
+    def __init__(self, scheduler=None):
+        self.groups = {}    # group_id -> {(x, y): building}
+        self.scheduler = scheduler
+
+    def __len__(self):
+        return sum(len(group) for group in self.groups.values())
+
+    def __iter__(self):
+        for group in self.groups.values():
+            yield from group.values()
+
+    def add(self, building, x, y):
+        self.groups.setdefault(building.group_id, {})[(x, y)] = building
+        if self.scheduler is not None:
+            self.scheduler.add(building)
+
+    def remove_group(self, group_id):
+        group = self.groups.pop(group_id, {})
+        if self.scheduler is not None:
+            for building in group.values():
+                self.scheduler.remove(building)
+        return group
+
+    def remove_groups(self, group_ids):
+        removed = {}
+        for group_id in group_ids:
+            removed.update(self.remove_group(group_id))
+        return removed
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import pygame
+from settings import FPS
+from systems.blueprint_library import INDEX_FILE
+
+REPLAY_VERSION = 1
+
+# Only plain attributes are kept; window handles and the like don't replay
+def event_to_record(event):
+    attrs = {
+        key: list(value) if isinstance(value, tuple) else value
+        for key, value in event.dict.items()
+        if isinstance(value, (int, float, str, bool, tuple, list)) and key != "window"
+    }
+    return [event.type, attrs]
+
+def record_to_event(record):
+    event_type, attrs = record
+    return pygame.event.Event(event_type, {
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in attrs.items()
+    })
+
+def replay_sandbox(blueprint_folder, blueprint_names=None):
+    """Temporary folder for everything a replay writes, seeded with the recorded blueprints.
+
+    Returns (root, blueprint folder); the caller removes root when done.
+    """
+    root = tempfile.mkdtemp(prefix="pysim-replay-")
+    folder = os.path.join(root, "blueprints")
+    os.makedirs(folder)
+    for item in os.scandir(blueprint_folder):
+        if not item.name.endswith(".json") or item.name == INDEX_FILE:
+            continue
+        try:
+            with open(item.path) as f:
+                name = json.load(f).get("name", os.path.splitext(item.name)[0])
+        except (OSError, ValueError):
+            continue
+        # Blueprints saved after the recording was made are left out
+        if blueprint_names is None or name in blueprint_names:
+            shutil.copy2(item.path, folder)
+    return root, folder
+
+def world_checksum(world):
+    # Short hash of every building and its buffers, to compare two runs of one recording
+    digest = hashlib.sha1()
+    for x, y in sorted(world.occupied_positions()):
+        building = world.grid[y][x].building
+        digest.update(repr((x, y, building.name, sorted(building.input_buffer.items()),
+                            sorted(building.output_buffer.items()))).encode())
+    return digest.hexdigest()[:12]
+
+class PressedKeys:
+    """Stand-in for pygame.key.get_pressed() built from a set of key indices."""
+
+    def __init__(self, pressed):
+        self.pressed = set(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class LiveInput:
+    """Frame timing and input straight from pygame."""
+
+    def tick(self, clock):
+        return clock.tick(FPS)
+
+    def events(self):
+        return pygame.event.get()
+
+    def mouse_pos(self):
+        return pygame.mouse.get_pos()
+
+    def pressed_keys(self):
+        return pygame.key.get_pressed()
+
+    def sim_steps(self):
+        # Simulation ticks this frame must run, or None to let the clock decide
+        return None
+
+    def record_sim_steps(self, steps):
+        pass
+
+    def close(self):
+        pass
+
+class InputRecorder(LiveInput):
+    """Live input that also writes every frame's dt, events, mouse and keys to a JSON-lines file."""
+
+    def __init__(self, path, header):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "w")
+        self.file.write(json.dumps({"version": REPLAY_VERSION, **header}) + "\n")
+        self.frame = None
+
+    def tick(self, clock):
+        self.flush_frame()
+        dt = super().tick(clock)
+        self.frame = {"dt": dt, "events": [], "mouse": [0, 0], "keys": []}
+        return dt
+
+    def events(self):
+        events = super().events()
+        self.frame["events"] += [event_to_record(event) for event in events]
+        self.frame["mouse"] = list(pygame.mouse.get_pos())
+        return events
+
+    def pressed_keys(self):
+        keys = super().pressed_keys()
+        self.frame["keys"] = [i for i in range(len(keys)) if keys[i]]
+        return keys
+
+    def record_sim_steps(self, steps):
+        # Max speed ticks for wall-clock time, so the count is kept to replay it exactly
+        self.frame["ticks"] = steps
+
+    def flush_frame(self):
+        if self.frame is not None:
+            self.file.write(json.dumps(self.frame, separators=(",", ":")) + "\n")
+            self.frame = None
+
+    def close(self):
+        self.flush_frame()
+        self.file.close()
+        print(f"[Replay] Recording saved to {self.file.name}")
+
+class ReplayInput:
+    """Feeds a recording back frame by frame, at the recorded rate or as fast as possible."""
+
+    def __init__(self, path, max_speed=False):
+        with open(path) as f:
+            self.header = json.loads(f.readline())
+            self.frames = [json.loads(line) for line in f if line.strip()]
+        if self.header.get("version") != REPLAY_VERSION:
+            raise ValueError(f"unsupported replay version {self.header.get('version')}")
+
+        self.max_speed = max_speed
+        self.index = -1
+        self.frame = None
+        self.frame_ms = []
+        self.last_tick = None
+        self.start = time.perf_counter()
+
+    def tick(self, clock):
+        now = time.perf_counter()
+        if self.last_tick is not None:
+            self.frame_ms.append((now - self.last_tick) * 1000)
+        self.last_tick = now
+
+        if self.max_speed:
+            clock.tick()
+        else:
+            clock.tick(FPS)
+
+        self.index += 1
+        self.frame = self.frames[self.index] if self.index < len(self.frames) else None
+        return self.frame["dt"] if self.frame else 0
+
+    def events(self):
+        # Keep the window responsive, but only recorded input reaches the game
+        pygame.event.pump()
+        if self.frame is None:
+            return [pygame.event.Event(pygame.QUIT)]
+        return [record_to_event(record) for record in self.frame["events"]]
+
+    def mouse_pos(self):
+        return tuple(self.frame["mouse"]) if self.frame else (0, 0)
+
+    def pressed_keys(self):
+        return PressedKeys(self.frame["keys"] if self.frame else ())
+
+    def sim_steps(self):
+        # Recordings made before tick counts were stored fall back to the clock;
+        # the frame after the last one only quits
+        return self.frame.get("ticks") if self.frame else 0
+
+    def record_sim_steps(self, steps):
+        pass
+
+    def close(self):
+        wall = time.perf_counter() - self.start
+        played = min(self.index + 1, len(self.frames))
+        frames = sorted(self.frame_ms)
+        pick = lambda q: frames[min(len(frames) - 1, int(q * len(frames)))] if frames else 0.0
+        print(f"[Replay] {played} frames in {wall:.2f}s ({played / wall:.1f} fps), "
+              f"frame ms p50/p95/p99: {pick(0.50):.1f}/{pick(0.95):.1f}/{pick(0.99):.1f}")
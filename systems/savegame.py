@@ -0,0 +1,185 @@
+import json
+import os
+import shutil
+import numpy as np
+from settings import GRID_BACKEND, SIM_ENGINE
+from systems.array_grid import ArrayGrid
+from systems.building import Building
+from systems.chunked_grid import ChunkedGrid
+
+SAVE_VERSION = 1
+
+BUILDING_DTYPE = np.dtype([
+    ("x", np.int32), ("y", np.int32),
+    ("name", np.uint16), ("group", np.int32),
+    ("color", np.uint8, 3), ("timer", np.float64),
+])
+
+class WorldSnapshot:
+    """Copy of everything needed to rebuild a World, safe to write from another thread.
+
+    For object-per-tile worlds the terrain arrays may still be missing; they are
+    encoded by write_snapshot, on the writer's thread rather than the frame.
+    """
+
+    def __init__(self, meta, tile_type, subtype, buildings, world=None):
+        self.meta = meta
+        self.tile_type = tile_type
+        self.subtype = subtype
+        self.buildings = buildings
+        self.world = world          # set while the terrain still has to be encoded
+
+    def encode_terrain(self):
+        if self.tile_type is not None:
+            return
+        # Terrain never changes after a world is generated or loaded, so the
+        # encoding is kept on the world and reused by every later save
+        terrain = self.world.saved_terrain or encode_terrain(self.world.grid, self.world.width, self.world.height)
+        self.world.saved_terrain = terrain
+        self.meta["tile_types"], self.meta["subtypes"], self.tile_type, self.subtype = terrain
+        self.world = None
+
+def encode_terrain(grid, width, height):
+    # Per-tile Python loop over an object-per-tile grid; runs at most once per world
+    tile_types, subtypes = [], []
+    tile_type = np.zeros((height, width), dtype=np.uint8)
+    subtype = np.zeros((height, width), dtype=np.uint8)
+    for y, row in enumerate(grid):
+        for x, tile in enumerate(row):
+            if tile.tile_type not in tile_types:
+                tile_types.append(tile.tile_type)
+            if tile.subtype not in subtypes:
+                subtypes.append(tile.subtype)
+            tile_type[y, x] = tile_types.index(tile.tile_type)
+            subtype[y, x] = subtypes.index(tile.subtype)
+    return tile_types, subtypes, tile_type, subtype
+
+def can_snapshot(world):
+    return not isinstance(world.grid, ChunkedGrid)
+
+def snapshot_world(world):
+    if not can_snapshot(world):
+        raise ValueError("chunked worlds cannot be saved as a snapshot")
+
+    grid = world.grid
+    pending_terrain = None
+    if isinstance(grid, ArrayGrid):
+        tile_types, subtypes = list(grid.tile_types), list(grid.subtypes)
+        tile_type, subtype = grid.tile_type.copy(), grid.subtype.copy()
+    elif world.saved_terrain:
+        tile_types, subtypes, tile_type, subtype = world.saved_terrain
+    else:
+        tile_types = subtypes = tile_type = subtype = None
+        pending_terrain = world
+
+    # Building table: numeric columns packed, names/group ids/buffers in the metadata
+    names, groups, buffers = [], [], {}
+    records = np.zeros(len(world.registry), dtype=BUILDING_DTYPE)
+    i = 0
+    for group_id, members in world.registry.groups.items():
+        groups.append(group_id)
+        for (x, y), building in members.items():
+            if building.name not in names:
+                names.append(building.name)
+            records[i] = (x, y, names.index(building.name), len(groups) - 1,
+                          building.color, world.scheduler.progress(building))
+            if building.input_buffer or building.output_buffer:
+                buffers[str(i)] = [dict(building.input_buffer), dict(building.output_buffer)]
+            i += 1
+
+    meta = {
+        "version": SAVE_VERSION,
+        "width": world.width,
+        "height": world.height,
+        "seed": world.seed,
+        "tile_types": tile_types,
+        "subtypes": subtypes,
+        "building_names": names,
+        "groups": groups,
+        "buffers": buffers,
+        "journal_id": world.journal.id,
+        "journal_seq": world.journal.seq,
+    }
+    return WorldSnapshot(meta, tile_type, subtype, records, world=pending_terrain)
+
+def write_snapshot(snapshot, path):
+    # Write next to the target and swap it in, so a crash never leaves half a save
+    snapshot.encode_terrain()
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    np.save(os.path.join(tmp_path, "tile_type.npy"), snapshot.tile_type)
+    np.save(os.path.join(tmp_path, "subtype.npy"), snapshot.subtype)
+    np.save(os.path.join(tmp_path, "buildings.npy"), snapshot.buildings)
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump(snapshot.meta, f)
+
+    old_path = path + ".old"
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+def read_meta(path):
+    try:
+        with open(os.path.join(path, "meta.json")) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def load_world(path, backend=GRID_BACKEND, engine=SIM_ENGINE, mmap=False):
+    """Rebuilds a World from a snapshot folder.
+
+    mmap=True memory-maps the tile arrays instead of reading them, for read-only
+    runs such as headless benchmarks; a live game must not keep the save folder
+    mapped, since the next save replaces it.
+    """
+    from modes.play_mode import World
+
+    meta = read_meta(path)
+    if meta is None:
+        raise ValueError(f"no readable snapshot at {path}")
+    if meta.get("version") != SAVE_VERSION:
+        raise ValueError(f"unsupported save version {meta.get('version')}")
+
+    # Memory-mapped copy-on-write, pages load as they are touched
+    mmap_mode = "c" if mmap else None
+    tile_type = np.load(os.path.join(path, "tile_type.npy"), mmap_mode=mmap_mode)
+    subtype = np.load(os.path.join(path, "subtype.npy"), mmap_mode=mmap_mode)
+    records = np.load(os.path.join(path, "buildings.npy"))
+
+    world = World(meta["width"], meta["height"], backend, engine, seed=None)
+    world.seed = meta["seed"]
+    tile_types, subtypes = meta["tile_types"], meta["subtypes"]
+
+    grid = world.grid
+    if isinstance(grid, ArrayGrid):
+        grid.tile_types, grid.subtypes = list(tile_types), list(subtypes)
+        grid.tile_type, grid.subtype = tile_type, subtype
+    else:
+        default_type = tile_types.index("basic") if "basic" in tile_types else -1
+        default_subtype = subtypes.index(None) if None in subtypes else -1
+        ys, xs = np.nonzero((tile_type != default_type) | (subtype != default_subtype))
+        for y, x in zip(ys.tolist(), xs.tolist()):
+            tile = grid[y][x]
+            tile.tile_type = tile_types[tile_type[y, x]]
+            tile.subtype = subtypes[subtype[y, x]]
+        if not mmap:
+            world.saved_terrain = (list(tile_types), list(subtypes), tile_type, subtype)
+
+    names, groups, buffers = meta["building_names"], meta["groups"], meta["buffers"]
+    for i, record in enumerate(records):
+        building = Building(names[record["name"]], tuple(int(c) for c in record["color"]), group_id=groups[record["group"]])
+        building.timer = float(record["timer"])
+        if str(i) in buffers:
+            inputs, outputs = buffers[str(i)]
+            building.input_buffer.update(inputs)
+            building.output_buffer.update(outputs)
+
+        x, y = int(record["x"]), int(record["y"])
+        grid[y][x].set_occupied(building)
+        world.registry.add(building, x, y)
+
+    return world
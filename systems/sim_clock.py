@@ -0,0 +1,59 @@
+import time
+from settings import SIM_TICK_MS, SIM_MAX_CATCH_UP, SIM_MAX_SPEED_BUDGET_MS
+
+SIM_SPEEDS = [1, 4, 16, None]   # None runs as many ticks as fit in the frame budget
+
+class SimulationClock:
+    """Fixed-timestep driver: frame time goes in, whole simulation ticks come out."""
+
+    def __init__(self, tick_ms=SIM_TICK_MS, max_catch_up=SIM_MAX_CATCH_UP, budget_ms=SIM_MAX_SPEED_BUDGET_MS):
+        self.tick_ms = tick_ms
+        self.max_catch_up = max_catch_up
+        self.budget_ms = budget_ms
+        self.speed_index = 0
+        self.accumulator = 0
+        self.ticks = 0
+
+    @property
+    def speed(self):
+        return SIM_SPEEDS[self.speed_index]
+
+    def speed_label(self):
+        return "max" if self.speed is None else f"{self.speed}x"
+
+    def set_speed(self, index):
+        self.speed_index = max(0, min(index, len(SIM_SPEEDS) - 1))
+        self.accumulator = 0
+
+    def advance(self, dt, tick_fn, steps=None):
+        # steps forces the tick count, e.g. to replay a max-speed frame exactly as recorded
+        if steps is not None:
+            for _ in range(steps):
+                tick_fn(self.tick_ms)
+            self.ticks += steps
+            return steps
+
+        if self.speed is None:
+            deadline = time.perf_counter() + self.budget_ms / 1000
+            steps = 0
+            while time.perf_counter() < deadline:
+                tick_fn(self.tick_ms)
+                steps += 1
+            self.ticks += steps
+            return steps
+
+        self.accumulator += dt * self.speed
+        steps = int(self.accumulator // self.tick_ms)
+
+        # Drop time we can't catch up on instead of spiralling on slow frames
+        max_steps = self.max_catch_up * self.speed
+        if steps > max_steps:
+            steps = max_steps
+            self.accumulator = 0
+        else:
+            self.accumulator -= steps * self.tick_ms
+
+        for _ in range(steps):
+            tick_fn(self.tick_ms)
+        self.ticks += steps
+        return steps
@@ -0,0 +1,68 @@
+import pygame
+from collections import OrderedDict
+from settings import TILE_SIZE, SPRITE_CACHE_MAX
+
+class SpriteCache:
+    """Pre-scaled surfaces for buildings, components and preview ghosts.
+
+    Sprites are built on first use and keyed by everything that changes their
+    pixels, so drawing is a single blit; the least recently used are dropped
+    once there are more than max_sprites.
+    """
+
+    def __init__(self, max_sprites=SPRITE_CACHE_MAX):
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()
+
+    def lookup(self, key):
+        surf = self.sprites.get(key)
+        if surf is not None:
+            self.sprites.move_to_end(key)
+        return surf
+
+    def store(self, key, surf):
+        self.sprites[key] = surf
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return surf
+
+    def body(self, color, zoom, size=(1, 1), alpha=255):
+        # Building/component square, inset by 4px (scaled) on every side
+        key = ("body", color, size, zoom, alpha)
+        surf = self.lookup(key)
+        if surf is None:
+            tile_px = TILE_SIZE * zoom
+            width = max(1, int(size[0] * tile_px) - int(8 * zoom))
+            height = max(1, int(size[1] * tile_px) - int(8 * zoom))
+            if alpha < 255:
+                surf = pygame.Surface((width, height), pygame.SRCALPHA)
+                surf.fill(tuple(color) + (alpha,))
+            else:
+                surf = pygame.Surface((width, height))
+                surf.fill(color)
+            surf = self.store(key, surf)
+        return surf
+
+    def tile(self, color, zoom):
+        # Opaque ground square for one tile
+        key = ("tile", color, zoom)
+        surf = self.lookup(key)
+        if surf is None:
+            scaled_tile = int(TILE_SIZE * zoom)
+            surf = pygame.Surface((scaled_tile, scaled_tile))
+            surf.fill(color)
+            surf = self.store(key, surf)
+        return surf
+
+    def tint(self, rgba, zoom, size=(1, 1)):
+        # Translucent full-tile overlay, e.g. the valid/invalid placement underlay
+        key = ("tint", rgba, size, zoom)
+        surf = self.lookup(key)
+        if surf is None:
+            tile_px = TILE_SIZE * zoom
+            surf = pygame.Surface((int(size[0] * tile_px), int(size[1] * tile_px)), pygame.SRCALPHA)
+            surf.fill(rgba)
+            surf = self.store(key, surf)
+        return surf
+
+SPRITES = SpriteCache()
@@ -1,13 +1,59 @@
 from settings import *
 
+def base_color(tile_type, subtype, has_building=False):
+    # Tile colour before highlights; also used for the one-pixel-per-tile LOD raster
+    if has_building:
+        return TILE_BASE_COLORS.get("building", TILE_BASE_COLORS["building_fallback"])
+    key = f"{tile_type}:{subtype}" if tile_type == "resource" else tile_type
+    return TILE_BASE_COLORS.get(key, TILE_BASE_COLORS["unknown"])
+
 class Tile:
     def __init__(self, tile_type="basic", subtype=None):
         self.tile_type = tile_type      # "basic" or "resource"
         self.subtype = subtype          # e.g. "coal", "iron", etc.
         self.state = "clear"            # or "occupied"
         self.building = None
-        self.highlight_mode = None      # "buildable", "invalid", etc.
-        self.highlighted = False
+        self._highlight_mode = None     # "buildable", "invalid", etc.
+        self._highlighted = False
+
+        # Grid notified when this tile needs repainting
+        self.owner = None
+        self.x = 0
+        self.y = 0
+
+    def attach(self, owner, x, y):
+        self.owner = owner
+        self.x = x
+        self.y = y
+
+    def mark_highlight(self):
+        if self.owner is not None:
+            active = self._highlighted or self._highlight_mode is not None
+            self.owner.mark_tile_highlighted(self.x, self.y, active)
+
+    def mark_changed(self):
+        if self.owner is not None:
+            self.owner.mark_tile_changed(self.x, self.y)
+
+    @property
+    def highlight_mode(self):
+        return self._highlight_mode
+
+    @highlight_mode.setter
+    def highlight_mode(self, mode):
+        if mode != self._highlight_mode:
+            self._highlight_mode = mode
+            self.mark_highlight()
+
+    @property
+    def highlighted(self):
+        return self._highlighted
+
+    @highlighted.setter
+    def highlighted(self, value):
+        if value != self._highlighted:
+            self._highlighted = value
+            self.mark_highlight()
 
     def is_clear(self):
         return self.state == "clear" and self.building is None
@@ -18,10 +64,12 @@ class Tile:
     def set_occupied(self, obj):
         self.state = "occupied"
         self.building = obj
+        self.mark_changed()
 
     def clear(self):
         self.state = "clear"
         self.building = None
+        self.mark_changed()
 
     def is_placeable_by(self, component, strict=True):
         """Checks if a component can be placed on this tile"""
@@ -41,11 +89,7 @@ class Tile:
         self.highlighted = False
 
     def get_color(self):
-        if self.building is not None:
-            base = TILE_BASE_COLORS.get("building", TILE_BASE_COLORS["building_fallback"])
-        else:
-            key = f"{self.tile_type}:{self.subtype}" if self.tile_type == "resource" else self.tile_type
-            base = TILE_BASE_COLORS.get(key, TILE_BASE_COLORS["unknown"])
+        base = base_color(self.tile_type, self.subtype, self.building is not None)
 
         # Prioritize highlight_mode first
         color = HIGHLIGHT_COLORS.get(self.highlight_mode, base)
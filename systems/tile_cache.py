@@ -0,0 +1,78 @@
+import pygame
+from collections import OrderedDict
+from settings import CHUNK_SIZE, TILE_CACHE_MAX_CHUNKS
+
+class TileLayerCache:
+    def __init__(self, chunk_size=CHUNK_SIZE, max_chunks=TILE_CACHE_MAX_CHUNKS):
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.zoom = None
+        self.chunks = OrderedDict()     # (cx, cy) -> Surface, least recently drawn first
+        self.dirty = {}                 # (cx, cy) -> set of (gx, gy) to repaint
+
+    def mark_dirty(self, gx, gy):
+        key = (gx // self.chunk_size, gy // self.chunk_size)
+        if key in self.chunks:
+            self.dirty.setdefault(key, set()).add((gx, gy))
+
+    def invalidate(self):
+        self.chunks.clear()
+        self.dirty.clear()
+
+    # tile_blits_fn(blits, tile, px, py) appends (surface, position) pairs for one
+    # tile drawn at (px, py); each chunk is then painted with a single blits() call
+
+    def render_chunk(self, grid, cx, cy, scaled_tile, tile_blits_fn):
+        size = self.chunk_size
+        x0, y0 = cx * size, cy * size
+        cols = min(size, len(grid[0]) - x0)
+        rows = min(size, len(grid) - y0)
+
+        surf = pygame.Surface((cols * scaled_tile, rows * scaled_tile))
+        blits = []
+        for ly in range(rows):
+            row = grid[y0 + ly]
+            py = ly * scaled_tile
+            for lx in range(cols):
+                tile_blits_fn(blits, row[x0 + lx], lx * scaled_tile, py)
+        surf.blits(blits, doreturn=False)
+        return surf
+
+    def repaint(self, surf, grid, cx, cy, tiles, scaled_tile, tile_blits_fn):
+        x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+        blits = []
+        for gx, gy in tiles:
+            tile_blits_fn(blits, grid[gy][gx], (gx - x0) * scaled_tile, (gy - y0) * scaled_tile)
+        surf.blits(blits, doreturn=False)
+
+    def draw(self, screen, grid, viewport, tile_blits_fn):
+        if viewport.zoom != self.zoom:
+            self.invalidate()
+            self.zoom = viewport.zoom
+
+        size = self.chunk_size
+        scaled_tile = viewport.scaled_tile
+        chunk_px = size * scaled_tile
+
+        blits = []
+        for cy in range(viewport.first_y // size, viewport.last_y // size + 1):
+            for cx in range(viewport.first_x // size, viewport.last_x // size + 1):
+                key = (cx, cy)
+                surf = self.chunks.get(key)
+                if surf is None:
+                    surf = self.render_chunk(grid, cx, cy, scaled_tile, tile_blits_fn)
+                    self.chunks[key] = surf
+                    self.dirty.pop(key, None)
+                else:
+                    self.chunks.move_to_end(key)
+                    tiles = self.dirty.pop(key, None)
+                    if tiles:
+                        self.repaint(surf, grid, cx, cy, tiles, scaled_tile, tile_blits_fn)
+
+                blits.append((surf, viewport.to_screen(cx * chunk_px, cy * chunk_px)))
+        screen.blits(blits, doreturn=False)
+
+        # --- Drop chunks that have been off screen the longest
+        while len(self.chunks) > self.max_chunks:
+            key, _ = self.chunks.popitem(last=False)
+            self.dirty.pop(key, None)
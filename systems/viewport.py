@@ -0,0 +1,29 @@
+import math
+from settings import TILE_SIZE
+
+class Viewport:
+    """Visible tile range for one frame, computed once and shared by the render passes."""
+
+    def __init__(self, camera_x, camera_y, zoom, view_w, view_h, offset_top, grid_w, grid_h):
+        self.camera_x = camera_x
+        self.camera_y = camera_y
+        self.zoom = zoom
+        self.view_w = view_w
+        self.view_h = view_h
+        self.offset_top = offset_top
+
+        # Below zoom 1/32 a tile is less than a pixel; scaled_tile is only used by
+        # the per-tile renderers, which never run at those zoom levels
+        self.tile_px = TILE_SIZE * zoom
+        self.scaled_tile = int(self.tile_px)
+
+        # Inclusive range of grid tiles that touch the view
+        self.first_x = max(0, int(camera_x // self.tile_px))
+        self.first_y = max(0, int(camera_y // self.tile_px))
+        self.last_x = min(grid_w - 1, int((camera_x + view_w) // self.tile_px))
+        self.last_y = min(grid_h - 1, int((camera_y + view_h) // self.tile_px))
+
+    def to_screen(self, px, py):
+        # World pixel position -> screen position; floor, not int(), so positions left of
+        # or above the view round the same way as those inside it
+        return math.floor(px - self.camera_x), math.floor(py - self.camera_y) + self.offset_top
@@ -0,0 +1,84 @@
+import numpy as np
+from settings import TILE_BASE_COLORS, RESOURCE_SCALE, RESOURCE_THRESHOLD
+from systems.array_grid import ArrayGrid
+from systems.tile import Tile
+
+# One deposit layer per resource subtype that has a tile color
+RESOURCE_SUBTYPES = [key.split(":", 1)[1] for key in TILE_BASE_COLORS if key.startswith("resource:")]
+
+# Octaves of value noise as (lattice spacing relative to RESOURCE_SCALE, weight)
+OCTAVES = [(1.0, 0.65), (0.35, 0.35)]
+
+def lattice_hash(seed, xs, ys):
+    # Deterministic pseudo-random value in [0, 1) per integer lattice point
+    with np.errstate(over="ignore"):
+        h = (xs.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+             ^ ys.astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F)
+             ^ np.uint64(seed) * np.uint64(0x165667B19E3779F9))
+        h ^= h >> np.uint64(31)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(29)
+    return ((h >> np.uint64(40)).astype(np.float32) / np.float32(1 << 24))
+
+def value_noise(seed, x0, y0, width, height, spacing):
+    # Smoothly interpolated lattice noise sampled at tiles [x0, x0+width) x [y0, y0+height)
+    fx = (np.arange(x0, x0 + width) + 0.5) / spacing
+    fy = (np.arange(y0, y0 + height) + 0.5) / spacing
+    ix, iy = np.floor(fx).astype(np.int64), np.floor(fy).astype(np.int64)
+
+    # Hash only the lattice points the region touches, then gather
+    lx0, ly0 = ix[0], iy[0]
+    lxs = np.arange(lx0, ix[-1] + 2)
+    lys = np.arange(ly0, iy[-1] + 2)
+    # Offset keeps lattice coordinates non-negative for the unsigned hash
+    lattice = lattice_hash(seed, lxs[None, :] + (1 << 40), lys[:, None] + (1 << 40))
+
+    tx = (fx - ix).astype(np.float32)
+    ty = (fy - iy).astype(np.float32)
+    sx = tx * tx * (3 - 2 * tx)
+    sy = (ty * ty * (3 - 2 * ty))[:, None]
+
+    # Separable interpolation: along x on the few lattice rows, then along y
+    cx, cy = ix - lx0, iy - ly0
+    rows = lattice[:, cx] + (lattice[:, cx + 1] - lattice[:, cx]) * sx
+    top, bottom = rows[cy], rows[cy + 1]
+    return top + (bottom - top) * sy
+
+def generate_deposits(seed, x0, y0, width, height):
+    """Resource layout for a region: 0 = no deposit, i = RESOURCE_SUBTYPES[i - 1].
+
+    Noise is a function of absolute tile coordinates, so generating a map in
+    chunks gives exactly the same result as generating it in one pass.
+    """
+    best = np.full((height, width), RESOURCE_THRESHOLD, dtype=np.float32)
+    deposits = np.zeros((height, width), dtype=np.uint8)
+
+    for index, _ in enumerate(RESOURCE_SUBTYPES, start=1):
+        field = np.zeros((height, width), dtype=np.float32)
+        for octave, (spacing, weight) in enumerate(OCTAVES):
+            layer_seed = (seed * 1000003 + index * 101 + octave) & 0xFFFFFFFF
+            noise = value_noise(layer_seed, x0, y0, width, height, RESOURCE_SCALE * spacing)
+            noise *= np.float32(weight)
+            field += noise
+
+        richer = field > best
+        deposits[richer] = index
+        np.maximum(best, field, out=best)
+
+    return deposits
+
+def paint_deposits(grid, deposits, x0=0, y0=0):
+    # Turn deposit codes into resource tiles on any grid backend
+    if isinstance(grid, ArrayGrid):
+        mask = deposits > 0
+        subtype_codes = np.array(
+            [0] + [grid.intern(grid.subtypes, subtype) for subtype in RESOURCE_SUBTYPES],
+            dtype=np.uint8
+        )
+        grid.tile_type[y0:y0 + deposits.shape[0], x0:x0 + deposits.shape[1]][mask] = grid.intern(grid.tile_types, "resource")
+        grid.subtype[y0:y0 + deposits.shape[0], x0:x0 + deposits.shape[1]][mask] = subtype_codes[deposits[mask]]
+        return
+
+    ys, xs = np.nonzero(deposits)
+    for y, x in zip(ys.tolist(), xs.tolist()):
+        grid[y0 + y][x0 + x] = Tile("resource", RESOURCE_SUBTYPES[deposits[y, x] - 1])
@@ -0,0 +1,86 @@
+import math
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+from settings import *
+from modes.play_mode import World
+from systems.building import RECIPES
+
+OFFSET_TOP = 50
+
+def capture_tile_blits(world):
+    # The tile_blits closure World.draw hands to the chunk cache
+    captured = {}
+    world.draw_tiles_and_grid = lambda screen, offset_top=0, offset_bottom=0, tile_blits_fn=None: captured.update(fn=tile_blits_fn)
+    world.draw(None, offset_y=OFFSET_TOP)
+    del world.draw_tiles_and_grid
+    return captured["fn"]
+
+def draw_per_tile(world, screen):
+    # Reference renderer: every visible tile drawn on its own at floor(world px - camera)
+    scaled_tile = int(TILE_SIZE * world.zoom)
+    tile_blits = capture_tile_blits(world)
+    view_h = SCREEN_HEIGHT - OFFSET_TOP
+
+    blits = []
+    for gy in range(world.height):
+        py = math.floor(gy * scaled_tile - world.camera_y) + OFFSET_TOP
+        if py + scaled_tile <= OFFSET_TOP or py >= SCREEN_HEIGHT:
+            continue
+        for gx in range(world.width):
+            px = math.floor(gx * scaled_tile - world.camera_x)
+            if -scaled_tile < px < SCREEN_WIDTH:
+                tile_blits(blits, world.grid[gy][gx], px, py)
+    screen.set_clip(pygame.Rect(0, OFFSET_TOP, SCREEN_WIDTH, view_h))
+    screen.blits(blits, doreturn=False)
+
+    # Grid lines on the same tile edges
+    first_x = math.floor(world.camera_x // scaled_tile * scaled_tile - world.camera_x)
+    for px in range(first_x, SCREEN_WIDTH, scaled_tile):
+        pygame.draw.line(screen, BLUEPRINT_BG, (px, OFFSET_TOP), (px, SCREEN_HEIGHT))
+    first_y = math.floor(world.camera_y // scaled_tile * scaled_tile - world.camera_y) + OFFSET_TOP
+    for py in range(first_y, SCREEN_HEIGHT, scaled_tile):
+        pygame.draw.line(screen, BLUEPRINT_BG, (0, py), (SCREEN_WIDTH, py))
+    screen.set_clip(None)
+
+@pytest.mark.parametrize("backend", ["tiles", "numpy"])
+@pytest.mark.parametrize("zoom, camera", [
+    (1.0, (301.5, 77.25)),
+    (1.0, (0.5, 0.5)),
+    (1.5, (1000.75, 333.4)),
+    (0.5, (120.2, 45.9)),
+])
+def test_fractional_camera_matches_per_tile_drawing(backend, zoom, camera):
+    world = World(80, 60, backend)
+    world.place_building(40, 7, "TST", tuple(RECIPES["TST"]["color"]))
+    world.place_building(9, 2, "TST", tuple(RECIPES["TST"]["color"]))
+    world.zoom = zoom
+    world.camera_x, world.camera_y = camera
+
+    chunked = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    chunked.fill(BACKGROUND_COLOR)
+    # main.py clips the world view the same way
+    chunked.set_clip(pygame.Rect(0, OFFSET_TOP, SCREEN_WIDTH, SCREEN_HEIGHT - OFFSET_TOP))
+    world.draw(chunked, offset_y=OFFSET_TOP)
+
+    reference = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    reference.fill(BACKGROUND_COLOR)
+    draw_per_tile(world, reference)
+
+    assert pygame.image.tobytes(chunked, "RGB") == pygame.image.tobytes(reference, "RGB")
+
+def test_building_sits_on_its_tile_with_fractional_camera():
+    world = World(80, 60, "tiles")
+    color = tuple(RECIPES["TST"]["color"])
+    world.place_building(40, 7, "TST", color)
+    world.camera_x, world.camera_y = 301.5, 77.25
+
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    world.draw(screen, offset_y=OFFSET_TOP)
+
+    # Tile (40, 7) starts at floor(1280 - 301.5), floor(224 - 77.25) + 50; the body is inset by 4px
+    left, top = 978 + 4, 146 + OFFSET_TOP + 4
+    assert screen.get_at((left, top))[:3] == color
+    assert screen.get_at((left - 1, top - 1))[:3] != color
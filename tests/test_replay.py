@@ -0,0 +1,74 @@
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pygame
+from settings import *
+from systems.blueprint_library import BlueprintLibrary
+from systems.replay import REPLAY_VERSION
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def key(code, unicode=""):
+    return [pygame.KEYDOWN, {"key": code, "unicode": unicode, "mod": 0}]
+
+def click(pos, button=1):
+    return [pygame.MOUSEBUTTONDOWN, {"button": button, "pos": list(pos)}]
+
+def write_recording(path):
+    # Places a blueprint all over the view, runs at max speed, quicksaves and loads,
+    # then names a new blueprint in build mode
+    frames = [[], [], [click((15, 830))]]
+    # One click per frame, since clicks act at the frame's mouse position; anchors on
+    # unsuitable terrain are simply rejected
+    frames += [[click((x, y))] for x in range(16, SCREEN_WIDTH, 2 * TILE_SIZE) for y in range(240, 760, 2 * TILE_SIZE)]
+    frames += [[key(pygame.K_4)], [], [], [], [key(pygame.K_F5)], [], [], [key(pygame.K_F9)], [], [],
+               [key(pygame.K_b, "b")], [click((15, 830))], [click((300, 300))], [key(pygame.K_q, "q")],
+               [key(pygame.K_r, "r"), key(pygame.K_t, "t")], [key(pygame.K_RETURN, "\r")],
+               [key(pygame.K_b, "b")], [], [], []]
+
+    header = {
+        "version": REPLAY_VERSION,
+        "seed": WORLD_SEED,
+        "backend": GRID_BACKEND,
+        "engine": SIM_ENGINE,
+        "blueprints": [blueprint.name for blueprint in BlueprintLibrary(os.path.join(ROOT, "data", "blueprints")).refresh()],
+    }
+    mouse = [200, 400]
+    ticks = 1
+    with open(path, "w") as f:
+        f.write(json.dumps(header) + "\n")
+        for events in frames:
+            mouse = next((event[1]["pos"] for event in events if "pos" in event[1]), mouse)
+            if any(event[1].get("key") == pygame.K_4 for event in events):
+                ticks = 40
+            f.write(json.dumps({"dt": 50, "events": events, "mouse": mouse, "keys": [], "ticks": ticks}) + "\n")
+
+def run_replay(path):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy")
+    output = subprocess.run(
+        [sys.executable, "main.py", "--replay", str(path), "--max-speed", "--headless"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    ).stdout
+    assert "playback may diverge" not in output
+    match = re.search(r"\[Replay\] World checksum (\w+) at tick (\d+)", output)
+    assert match, output
+    return match.groups()
+
+def listing(folder):
+    path = os.path.join(ROOT, folder)
+    return sorted(os.listdir(path)) if os.path.isdir(path) else None
+
+def test_replaying_twice_gives_the_same_world_and_writes_no_files(tmp_path):
+    recording = tmp_path / "session.jsonl"
+    write_recording(recording)
+    blueprints, saves = listing("data/blueprints"), listing("saves")
+
+    first = run_replay(recording)
+    second = run_replay(recording)
+
+    assert first == second
+    assert listing("data/blueprints") == blueprints
+    assert listing("saves") == saves
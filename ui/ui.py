@@ -1,13 +1,35 @@
 import pygame
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from collections import OrderedDict
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, TEXT_CACHE_MAX
 
 TOP_UI_PADDING = 5
 UI_BOTTOM_HEIGHT = 120  # Height of the bottom UI panel
 
+class TextCache:
+    """Rendered text surfaces by (text, color), so unchanged strings are not re-rendered."""
+
+    def __init__(self, font, max_entries=TEXT_CACHE_MAX):
+        self.font = font
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, text, color):
+        key = (text, color)
+        surf = self.surfaces.get(key)
+        if surf is None:
+            surf = self.font.render(text, True, color)
+            self.surfaces[key] = surf
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surf
+
 class GUI:
 
     def __init__(self, font_size=16):
         self.font = pygame.font.SysFont("consolas", font_size)
+        self.text_cache = TextCache(self.font)
         self.bg_color = (30, 30, 30)
         self.text_color = (255, 255, 255)
         self.padding = 5
@@ -18,19 +40,31 @@ class GUI:
         self.top_height = 0          # Updated in draw()
         self.bottom_height = UI_BOTTOM_HEIGHT
 
+    def top_bar_rect(self, debug_lines):
+        height = len(debug_lines) * self.line_height + 2 * self.padding if debug_lines else 0
+        return pygame.Rect(0, 0, SCREEN_WIDTH, height)
+
+    def bottom_bar_rect(self):
+        return pygame.Rect(0, SCREEN_HEIGHT - self.bottom_height, SCREEN_WIDTH, self.bottom_height)
+
     def draw(self, screen, debug_lines=None, items=None, selected_index=None):
+        self.draw_top(screen, debug_lines)
+        self.draw_bottom(screen, items, selected_index)
+
+    def draw_top(self, screen, debug_lines=None):
         # --- Top UI bar (e.g. debug)
-        self.top_height = len(debug_lines) * self.line_height + 2 * self.padding if debug_lines else 0
-        pygame.draw.rect(screen, self.bg_color, (0, 0, SCREEN_WIDTH, self.top_height))
+        rect = self.top_bar_rect(debug_lines)
+        self.top_height = rect.height
+        pygame.draw.rect(screen, self.bg_color, rect)
 
         if debug_lines:
             for i, line in enumerate(debug_lines):
-                text_surf = self.font.render(line, True, self.text_color)
+                text_surf = self.text_cache.render(line, self.text_color)
                 screen.blit(text_surf, (self.padding, self.padding + i * self.line_height))
 
+    def draw_bottom(self, screen, items=None, selected_index=None):
         # --- Bottom UI bar (e.g. items)
-        ui_rect = pygame.Rect(0, SCREEN_HEIGHT - self.bottom_height, SCREEN_WIDTH, self.bottom_height)
-        pygame.draw.rect(screen, (40, 40, 40), ui_rect)
+        pygame.draw.rect(screen, (40, 40, 40), self.bottom_bar_rect())
 
         if items:
             self.draw_item_buttons(screen, items, selected_index)
@@ -58,7 +92,7 @@ class GUI:
             pygame.draw.rect(screen, border_color, rect, 2)
 
             # Label
-            label = self.font.render(item.name, True, self.text_color)
+            label = self.text_cache.render(item.name, self.text_color)
             label_rect = label.get_rect(center=rect.center)
             screen.blit(label, label_rect)
 
@@ -78,6 +112,7 @@ class GUI:
 class BlueprintNamingOverlay:
     def __init__(self, font, x, y, width):
         self.font = font
+        self.text_cache = TextCache(font)
         self.rect = pygame.Rect(x, y, width, 40)
         self.active = False
         self.text = ""
@@ -121,7 +156,7 @@ class BlueprintNamingOverlay:
         pygame.draw.rect(screen, (30, 30, 30), self.rect)
         pygame.draw.rect(screen, (200, 200, 200), self.rect, 2)
 
-        text_surf = self.font.render(self.text, True, (255, 255, 255))
+        text_surf = self.text_cache.render(self.text, (255, 255, 255))
         screen.blit(text_surf, (self.rect.x + 5, self.rect.y + 8))
 
         # Draw blinking cursor